@@ -0,0 +1,94 @@
+"""
+Сравнение доли попаданий кеша переходов: LRU против W-TinyLFU.
+
+Прогоняет через `LRUCache` и `TinyLFUCache` одинаковые трассы обращений
+к коротким ссылкам и выводит долю попаданий для нескольких размеров
+кеша. Синтетические трассы:
+    zipf      — популярность ссылок по закону Ципфа;
+    zipf+scan — то же, вперемешку с сериями обращений к случайным
+                несуществующим ID (перебор ботами).
+Можно воспроизвести и реальную нагрузку по журналу переходов
+(`ACCESS_LOG_PATH`), учитывая, что при `ACCESS_LOG_SAMPLE_RATE` < 1 в нём
+есть лишь часть успешных переходов:
+    python benchmarks/cache_replay.py --access-log access.log
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from yacut.resolution_cache import CACHE_POLICIES  # noqa: E402
+
+SCAN_BURST = 500
+SCAN_EVERY = 5_000
+
+
+def zipf_trace(keys: int, length: int, skew: float,
+               rng: random.Random) -> list[str]:
+    weights = itertools.accumulate(
+        1 / rank ** skew for rank in range(1, keys + 1)
+    )
+    population = [f'id{rank}' for rank in range(keys)]
+    return rng.choices(population, cum_weights=list(weights), k=length)
+
+
+def with_scans(trace: list[str], rng: random.Random) -> list[str]:
+    mixed = []
+    for start in range(0, len(trace), SCAN_EVERY):
+        mixed.extend(trace[start:start + SCAN_EVERY])
+        mixed.extend(
+            f'scan{rng.getrandbits(48):x}' for _ in range(SCAN_BURST)
+        )
+    return mixed
+
+
+def read_access_log(path: str) -> list[str]:
+    with open(path, encoding='utf-8') as log:
+        return [json.loads(line)['short'] for line in log if line.strip()]
+
+
+def hit_ratio(policy: str, size: int, trace: list[str]) -> float:
+    cache = CACHE_POLICIES[policy](size)
+    hits = 0
+    for short_id in trace:
+        if cache.get(short_id) is None:
+            cache.put(short_id, True)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--keys', type=int, default=100_000,
+                        help='Число различных ссылок в трассе Ципфа.')
+    parser.add_argument('--length', type=int, default=500_000)
+    parser.add_argument('--skew', type=float, default=0.9)
+    parser.add_argument('--sizes', default='1000,5000,20000')
+    parser.add_argument('--access-log')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.access_log:
+        traces = {'access-log': read_access_log(args.access_log)}
+    else:
+        trace = zipf_trace(args.keys, args.length, args.skew, rng)
+        traces = {'zipf': trace, 'zipf+scan': with_scans(trace, rng)}
+    for name, trace in traces.items():
+        print(f'{name}: {len(trace)} обращений')
+        for size in map(int, args.sizes.split(',')):
+            lru = hit_ratio('lru', size, trace)
+            tinylfu = hit_ratio('tinylfu', size, trace)
+            print(
+                f'  {size:>7} записей: LRU {lru:6.1%}, '
+                f'W-TinyLFU {tinylfu:6.1%}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+"""
+Многопроцессный генератор нагрузки и soak-тест для YaCut.
+
+Запускает (или использует уже запущенный) экземпляр YaCut и нагружает
+его из нескольких процессов смесью запросов: создание ссылок через API,
+переходы по существующим ссылкам и переходы по несуществующим (404).
+Популярность существующих ссылок распределена по закону Ципфа. По
+итогам выводятся пропускная способность, перцентили задержек, доля
+ошибок и рост потребления памяти сервером.
+
+Перед запуском отключите ограничение частоты запросов
+(RATELIMIT_ENABLED=false), иначе часть запросов получит 429.
+
+Примеры:
+    # поднять локальный сервер на временной базе и нагружать 60 секунд
+    python benchmarks/loadgen.py --start --duration 60
+
+    # soak-тест уже запущенного сервера в течение часа
+    python benchmarks/loadgen.py --url http://127.0.0.1:5000 \\
+        --server-pid 12345 --duration 3600 --processes 8
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import queue
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from bisect import bisect_left
+from itertools import accumulate
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+OPERATIONS = ('create', 'resolve', 'not_found')
+EXPECTED_STATUS = {'create': 201, 'resolve': 302, 'not_found': 404}
+RESERVOIR_SIZE = 20_000
+PERCENTILES = (50, 90, 99, 99.9)
+# Короче этого (в секундах) рост памяти в МиБ/ч не оценивается: на
+# коротком прогоне он отражает прогрев, а не утечку
+MEMORY_RATE_MIN_DURATION = 300
+
+
+class Reservoir:
+    """Равномерная выборка фиксированного размера из потока задержек."""
+
+    def __init__(self, size: int = RESERVOIR_SIZE):
+        self.size = size
+        self.seen = 0
+        self.samples: list[float] = []
+
+    def add(self, value: float) -> None:
+        self.seen += 1
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+            return
+        index = random.randrange(self.seen)
+        if index < self.size:
+            self.samples[index] = value
+
+
+class ZipfSampler:
+    """Выбор индекса из `n` элементов с вероятностью ~ 1 / rank ** s."""
+
+    def __init__(self, n: int, s: float):
+        self.cdf = list(accumulate(1 / rank ** s for rank in range(1, n + 1)))
+
+    def sample(self) -> int:
+        return bisect_left(self.cdf, random.random() * self.cdf[-1])
+
+
+def request(connection: http.client.HTTPConnection, method: str, path: str,
+            body: Optional[dict] = None) -> tuple[int, bytes]:
+    headers = {}
+    payload = None
+    if body is not None:
+        payload = json.dumps(body)
+        headers['Content-Type'] = 'application/json'
+    connection.request(method, path, body=payload, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def seed_links(host: str, port: int, count: int) -> list[str]:
+    """Создаёт ссылки, по которым затем будут выполняться переходы."""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    shorts = []
+    for index in range(count):
+        status, body = request(connection, 'POST', '/api/id/', {
+            'url': f'https://example.com/seed/{index}'
+        })
+        if status != EXPECTED_STATUS['create']:
+            raise RuntimeError(f'Не удалось создать ссылку: {status} {body}')
+        shorts.append(json.loads(body)['short_link'].rsplit('/', 1)[-1])
+    connection.close()
+    return shorts
+
+
+def worker(host: str, port: int, shorts: list[str], weights: list[float],
+           zipf_s: float, deadline: float, interval: float,
+           results: multiprocessing.Queue) -> None:
+    """
+    Выполняет запросы до `deadline` и отправляет статистику в `results`.
+
+    Каждые `interval` секунд отправляются счётчики за интервал, в конце —
+    выборки задержек по каждой операции.
+    """
+    random.seed(os.getpid() ^ time.time_ns())
+    zipf = ZipfSampler(len(shorts), zipf_s)
+    reservoirs = {operation: Reservoir() for operation in OPERATIONS}
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    counts = {operation: [0, 0] for operation in OPERATIONS}
+    next_report = time.monotonic() + interval
+    sequence = 0
+    while time.time() < deadline:
+        operation = random.choices(OPERATIONS, weights)[0]
+        if operation == 'create':
+            sequence += 1
+            method, path = 'POST', '/api/id/'
+            body = {'url': f'https://example.com/{os.getpid()}/{sequence}'}
+        elif operation == 'resolve':
+            method, path, body = 'GET', f'/{shorts[zipf.sample()]}', None
+        else:
+            method, path, body = 'GET', f'/nx{random.getrandbits(40)}', None
+        started = time.perf_counter()
+        try:
+            status, _ = request(connection, method, path, body)
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            status = None
+        reservoirs[operation].add((time.perf_counter() - started) * 1000)
+        counts[operation][0] += 1
+        counts[operation][1] += status != EXPECTED_STATUS[operation]
+        if time.monotonic() >= next_report:
+            results.put(('interval', counts))
+            counts = {operation: [0, 0] for operation in OPERATIONS}
+            next_report += interval
+    results.put(('interval', counts))
+    results.put(('latencies', {
+        operation: (reservoir.seen, reservoir.samples)
+        for operation, reservoir in reservoirs.items()
+    }))
+    connection.close()
+
+
+def rss_megabytes(pid: Optional[int]) -> Optional[float]:
+    """Возвращает резидентную память процесса по данным /proc."""
+    if pid is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(tmp_dir: str) -> tuple[subprocess.Popen, str]:
+    """Запускает YaCut на временной SQLite-базе и ждёт готовности."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        FLASK_APP='yacut',
+        DATABASE_URI=f'sqlite:///{os.path.join(tmp_dir, "load.sqlite3")}',
+        RATELIMIT_ENABLED='false',
+        PYTHONPATH=str(BASE_DIR),
+    )
+    subprocess.run(
+        [sys.executable, '-c',
+         'from yacut import app, db\n'
+         'with app.app_context():\n    db.create_all()'],
+        env=env, cwd=BASE_DIR, check=True
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'flask', 'run', '--port', str(port),
+         '--no-reload', '--with-threads'],
+        env=env, cwd=BASE_DIR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('Сервер не запустился')
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return float('nan')
+    index = min(
+        len(sorted_values) - 1, int(len(sorted_values) * percent / 100)
+    )
+    return sorted_values[index]
+
+
+def report(totals: dict, latencies: dict, elapsed: float,
+           memory: list[tuple[float, float]]) -> None:
+    print('\nИтоги:')
+    for operation in OPERATIONS:
+        requests, errors = totals[operation]
+        samples = sorted(latencies.get(operation, []))
+        quantiles = ' '.join(
+            f'p{value:g}={percentile(samples, value):.1f}'
+            for value in PERCENTILES
+        )
+        print(
+            f'  {operation:<10} {requests / elapsed:9.1f} RPS  '
+            f'ошибок {errors / max(requests, 1):7.2%}  мс: {quantiles}'
+        )
+    if len(memory) >= 2:
+        (start_time, start_rss), (end_time, end_rss) = memory[0], memory[-1]
+        if end_time - start_time >= MEMORY_RATE_MIN_DURATION:
+            hours = (end_time - start_time) / 3600
+            rate = f'{(end_rss - start_rss) / hours:+.1f} МиБ/ч'
+        else:
+            rate = (
+                f'прогон короче {MEMORY_RATE_MIN_DURATION} с, '
+                'рост не оценивается'
+            )
+        print(
+            f'  память сервера: {start_rss:.1f} -> {end_rss:.1f} МиБ '
+            f'({rate})'
+        )
+
+
+def sample_memory(memory: list[tuple[float, float]],
+                  pid: Optional[int]) -> Optional[float]:
+    rss = rss_megabytes(pid)
+    if rss is not None:
+        memory.append((time.time(), rss))
+    return rss
+
+
+def collect(results: multiprocessing.Queue,
+            workers: list[multiprocessing.Process], interval: float,
+            server_pid: Optional[int]) -> tuple:
+    """
+    Собирает статистику воркеров и печатает промежуточные итоги.
+
+    Завершается, когда все воркеры прислали выборки задержек или когда
+    очередь пуста, а живых воркеров не осталось (воркер упал).
+
+    Returns:
+        tuple: Итоговые счётчики, выборки задержек и замеры памяти.
+    """
+    started = time.time()
+    totals = {operation: [0, 0] for operation in OPERATIONS}
+    latencies = {operation: [] for operation in OPERATIONS}
+    memory = []
+    interval_requests = 0
+    finished = 0
+    next_report = time.monotonic() + interval
+    while finished < len(workers):
+        try:
+            kind, payload = results.get(timeout=0.5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in workers):
+                break
+            kind, payload = None, {}
+        for operation, values in payload.items():
+            if kind == 'interval':
+                totals[operation][0] += values[0]
+                totals[operation][1] += values[1]
+                interval_requests += values[0]
+            else:
+                latencies[operation].extend(values[1])
+        finished += kind == 'latencies'
+        if time.monotonic() >= next_report:
+            rss = sample_memory(memory, server_pid)
+            print(
+                f'[{time.time() - started:7.0f} с] '
+                f'{interval_requests / interval:9.1f} RPS'
+                + (f', RSS {rss:.1f} МиБ' if rss is not None else ''),
+                flush=True
+            )
+            interval_requests = 0
+            next_report += interval
+    dead = [
+        process for process in workers if process.exitcode not in (0, None)
+    ]
+    for process in dead:
+        print(
+            f'Воркер {process.pid} завершился с кодом {process.exitcode}, '
+            'его выборка задержек не учтена',
+            file=sys.stderr
+        )
+    return totals, latencies, memory
+
+
+def run(args: argparse.Namespace, base_url: str,
+        server_pid: Optional[int]) -> None:
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    shorts = seed_links(host, port, args.keys)
+    weights = [args.create, args.resolve, args.not_found]
+    deadline = time.time() + args.duration
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=worker, args=(
+            host, port, shorts, weights, args.zipf, deadline,
+            args.report_interval, results
+        ))
+        for _ in range(args.processes)
+    ]
+    started = time.time()
+    for process in workers:
+        process.start()
+    totals, latencies, memory = collect(
+        results, workers, args.report_interval, server_pid
+    )
+    for process in workers:
+        process.join()
+    sample_memory(memory, server_pid)
+    report(totals, latencies, time.time() - started, memory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help='Адрес уже запущенного сервера.')
+    parser.add_argument('--start', action='store_true',
+                        help='Запустить сервер на временной базе.')
+    parser.add_argument('--server-pid', type=int,
+                        help='PID сервера для замера памяти.')
+    parser.add_argument('--processes', type=int,
+                        default=multiprocessing.cpu_count())
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--report-interval', type=float, default=5)
+    parser.add_argument('--keys', type=int, default=1_000,
+                        help='Сколько ссылок создать перед нагрузкой.')
+    parser.add_argument('--zipf', type=float, default=1.1,
+                        help='Параметр s распределения Ципфа.')
+    parser.add_argument('--create', type=float, default=0.1,
+                        help='Доля запросов на создание.')
+    parser.add_argument('--resolve', type=float, default=0.85,
+                        help='Доля переходов по существующим ссылкам.')
+    parser.add_argument('--not-found', type=float, default=0.05,
+                        help='Доля переходов по несуществующим ссылкам.')
+    args = parser.parse_args()
+    if not args.start and not args.url:
+        parser.error('Укажите --url или --start')
+
+    if not args.start:
+        run(args, args.url, args.server_pid)
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        server, base_url = start_server(tmp_dir)
+        try:
+            run(args, base_url, server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
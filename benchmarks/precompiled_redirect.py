@@ -0,0 +1,94 @@
+"""
+Замер пропускной способности перенаправлений с подготовленными ответами.
+
+Вызывает WSGI-приложение напрямую (без сети) для набора коротких ссылок
+и сравнивает обычный режим (`redirect()` и запрос к базе данных на
+каждый переход) с режимом `REDIRECT_PRECOMPILED` и с отдельным
+WSGI-уровнем `RedirectDispatcher`. Также сравнивается стоимость самой
+сборки ответа: `redirect()` против готового `PrecompiledRedirect`.
+
+Запуск:
+    python benchmarks/precompiled_redirect.py --requests 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ['DATABASE_URI'] = 'sqlite:///:memory:'
+
+from flask import redirect  # noqa: E402
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+from yacut import app, db, resolution_cache  # noqa: E402
+from yacut.models import URLMap  # noqa: E402
+from yacut.redirect_app import RedirectDispatcher  # noqa: E402
+from yacut.resolution_cache import PrecompiledRedirect  # noqa: E402
+
+ORIGINAL = 'https://example.com/some/long/path?utm_source=yacut&id={}'
+
+
+def start_response(status, headers):
+    pass
+
+
+def requests_per_second(wsgi_app, environs: list[dict]) -> float:
+    started = time.perf_counter()
+    for environ in environs:
+        for _ in wsgi_app(environ, start_response):
+            pass
+    return len(environs) / (time.perf_counter() - started)
+
+
+def build_seconds(factory, count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return (time.perf_counter() - started) / count * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--links', type=int, default=1_000)
+    parser.add_argument('--requests', type=int, default=20_000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            URLMap(original=ORIGINAL.format(index), short=f'bench{index}')
+            for index in range(args.links)
+        )
+        db.session.commit()
+
+    environs = [
+        EnvironBuilder(path=f'/bench{random.randrange(args.links)}')
+        .get_environ()
+        for _ in range(args.requests)
+    ]
+    modes = {
+        'Flask, redirect()': (app, False),
+        'Flask, REDIRECT_PRECOMPILED': (app, True),
+        'RedirectDispatcher': (RedirectDispatcher(app), False),
+    }
+    for name, (wsgi_app, precompiled) in modes.items():
+        app.config['REDIRECT_PRECOMPILED'] = precompiled
+        resolution_cache.clear()
+        requests_per_second(wsgi_app, environs[:args.links])
+        rps = requests_per_second(wsgi_app, environs)
+        print(f'{name:<28}: {rps:10.0f} RPS')
+
+    location = ORIGINAL.format(0)
+    prebuilt = PrecompiledRedirect.build(location)
+    with app.test_request_context():
+        plain_cost = build_seconds(lambda: redirect(location), 50_000)
+        prebuilt_cost = build_seconds(prebuilt.to_response, 50_000)
+    print(f'redirect():                     {plain_cost:6.2f} мкс/ответ')
+    print(f'PrecompiledRedirect.to_response: {prebuilt_cost:6.2f} мкс/ответ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""initial url_map
+
+Схема таблицы url_map до появления миграций. Базу данных, созданную
+через `db.create_all()`, достаточно пометить этой ревизией:
+`flask db stamp 3f1c2a9d8b10`.
+
+Revision ID: 3f1c2a9d8b10
+Revises:
+Create Date: 2026-10-19 12:00:00
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d8b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'url_map',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('original', sa.String(length=256), nullable=False),
+        sa.Column('short', sa.String(length=16), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('short')
+    )
+
+
+def downgrade():
+    op.drop_table('url_map')
@@ -0,0 +1,40 @@
+"""add link_check
+
+Revision ID: 4e0a7c6d9b35
+Revises: b7d93e5f1a42
+Create Date: 2026-10-19 12:15:00
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4e0a7c6d9b35'
+down_revision = 'b7d93e5f1a42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'link_check',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('urlmap_id', sa.Integer(), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('is_alive', sa.Boolean(), nullable=False),
+        sa.Column('error', sa.String(length=256), nullable=True),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.Column('checked_at', sa.DateTime(), nullable=False),
+        sa.Column('next_check_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['urlmap_id'], ['url_map.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('urlmap_id')
+    )
+    op.create_index(
+        'ix_link_check_next_check_at', 'link_check', ['next_check_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_link_check_next_check_at', table_name='link_check')
+    op.drop_table('link_check')
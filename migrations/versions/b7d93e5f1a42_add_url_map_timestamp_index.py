@@ -0,0 +1,22 @@
+"""add url_map.timestamp index
+
+Revision ID: b7d93e5f1a42
+Revises: 3f1c2a9d8b10
+Create Date: 2026-10-19 12:10:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b7d93e5f1a42'
+down_revision = '3f1c2a9d8b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_url_map_timestamp', 'url_map', ['timestamp'])
+
+
+def downgrade():
+    op.drop_index('ix_url_map_timestamp', table_name='url_map')
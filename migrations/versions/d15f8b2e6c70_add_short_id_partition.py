@@ -0,0 +1,40 @@
+"""add short_id_partition
+
+Revision ID: d15f8b2e6c70
+Revises: 4e0a7c6d9b35
+Create Date: 2026-10-19 12:20:00
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd15f8b2e6c70'
+down_revision = '4e0a7c6d9b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'short_id_partition',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('prefix', sa.String(length=2), nullable=False),
+        sa.Column('owner', sa.String(length=128), nullable=False),
+        sa.Column('next_offset', sa.Integer(), nullable=False),
+        sa.Column('registered_at', sa.DateTime(), nullable=False),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('prefix')
+    )
+    op.create_index(
+        'ix_short_id_partition_heartbeat_at', 'short_id_partition',
+        ['heartbeat_at']
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_short_id_partition_heartbeat_at', table_name='short_id_partition'
+    )
+    op.drop_table('short_id_partition')
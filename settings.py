@@ -1,9 +1,95 @@
 import os
 
 
+def _env_flag(name: str, default: bool = False) -> bool:
+    return os.getenv(name, default=str(default)).lower() in (
+        'true', '1', 'yes'
+    )
+
+
 class Config(object):
     SQLALCHEMY_DATABASE_URI = os.getenv(
         'DATABASE_URI',
         default='sqlite:///db.sqlite3'
     )
     SECRET_KEY = os.getenv('FLASK_SECRET_KEY', default='secret-string')
+    # Ограничение частоты запросов (token bucket): ёмкость корзины и
+    # скорость её пополнения в токенах в секунду
+    RATELIMIT_ENABLED = _env_flag('RATELIMIT_ENABLED')
+    RATELIMIT_BACKEND = os.getenv('RATELIMIT_BACKEND', default='memory')
+    # Для хранилища sqlite: группы create и resolve пишут в отдельные
+    # файлы рядом с этим путём (ratelimit.create.sqlite3 и т. д.)
+    RATELIMIT_SQLITE_PATH = os.getenv(
+        'RATELIMIT_SQLITE_PATH',
+        default='ratelimit.sqlite3'
+    )
+    RATELIMIT_CREATE = (20, 0.5)
+    RATELIMIT_RESOLVE = (300, 100.0)
+    # API-ключи клиентов с собственным бюджетом (через запятую); запросы
+    # с другими ключами учитываются по IP-адресу
+    RATELIMIT_API_KEYS = frozenset(
+        key for key in os.getenv('RATELIMIT_API_KEYS', '').split(',') if key
+    )
+    # Число доверенных прокси перед приложением: адрес клиента берётся
+    # из X-Forwarded-For, заполненного ими; 0 — прокси нет
+    TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', default=0))
+    # Канонический адрес сервиса для коротких ссылок, например
+    # https://yac.ut; если не задан — берётся из адреса запроса
+    SHORT_URL_BASE = os.getenv('SHORT_URL_BASE')
+    # Ключ для административного API (заголовок X-API-Key); если не
+    # задан — административное API отключено
+    ADMIN_API_KEY = os.getenv('ADMIN_API_KEY')
+    # Отдавать перенаправления из кеша заранее подготовленных ответов
+    REDIRECT_PRECOMPILED = _env_flag('REDIRECT_PRECOMPILED')
+    RESOLUTION_CACHE_SIZE = int(
+        os.getenv('RESOLUTION_CACHE_SIZE', default=100_000)
+    )
+    # Политика вытеснения кеша переходов: tinylfu или lru
+    RESOLUTION_CACHE_POLICY = os.getenv(
+        'RESOLUTION_CACHE_POLICY', default='tinylfu'
+    )
+    # Отдельный бюджет и срок жизни (в секундах) для отметок о
+    # несуществующих коротких ссылках. Отметка снимается при создании
+    # ссылки только в создавшем её процессе, поэтому в остальных новая
+    # ссылка может отвечать 404 до истечения срока
+    RESOLUTION_NEGATIVE_CACHE_SIZE = int(
+        os.getenv('RESOLUTION_NEGATIVE_CACHE_SIZE', default=10_000)
+    )
+    RESOLUTION_NEGATIVE_TTL = float(
+        os.getenv('RESOLUTION_NEGATIVE_TTL', default=2)
+    )
+    # Сколько последних ссылок загрузить в кеш переходов, прежде чем
+    # /-/readyz сообщит о готовности узла; 0 — не прогревать
+    RESOLUTION_CACHE_WARMUP = int(
+        os.getenv('RESOLUTION_CACHE_WARMUP', default=0)
+    )
+    # Как долго (в секундах) /-/readyz использует результат проверки базы
+    HEALTH_DB_PROBE_INTERVAL = float(
+        os.getenv('HEALTH_DB_PROBE_INTERVAL', default=2)
+    )
+    # Обслуживать GET /<short> отдельным WSGI-приложением в обход Flask
+    REDIRECT_TIER_ENABLED = _env_flag('REDIRECT_TIER_ENABLED')
+    # Разрешить фоновой проверке ссылок обращаться к непубличным адресам
+    # (loopback, частные сети, 169.254.169.254); по умолчанию такие
+    # ссылки отмечаются как «Неподдерживаемый адрес»
+    LINK_CHECK_ALLOW_PRIVATE = _env_flag('LINK_CHECK_ALLOW_PRIVATE')
+    # Снимок таблицы URLMap для узлов, обслуживающих только переходы;
+    # если задан — переходы обслуживаются без обращения к базе данных
+    URLMAP_SNAPSHOT_PATH = os.getenv('URLMAP_SNAPSHOT_PATH')
+    # Лента изменений не отдаёт записи моложе этого числа секунд, чтобы
+    # не пропустить запись, транзакция которой зафиксирована позже
+    # транзакции записи с большим id
+    CHANGES_SAFETY_LAG = float(os.getenv('CHANGES_SAFETY_LAG', default=5))
+    # Генерировать ID из раздела пространства, арендованного процессом,
+    # чтобы исключить коллизии между процессами и узлами
+    SHORT_ID_PARTITIONED = _env_flag('SHORT_ID_PARTITIONED')
+    # Журнал переходов: файл (если не задан — журнал отключён; каждый
+    # процесс пишет в `<имя>.<pid><расширение>`), доля записываемых
+    # успешных переходов, размер очереди и ротация файлов
+    ACCESS_LOG_PATH = os.getenv('ACCESS_LOG_PATH')
+    ACCESS_LOG_SAMPLE_RATE = float(
+        os.getenv('ACCESS_LOG_SAMPLE_RATE', default=1.0)
+    )
+    ACCESS_LOG_QUEUE_SIZE = 10_000
+    ACCESS_LOG_MAX_BYTES = 100 * 1024 * 1024
+    ACCESS_LOG_BACKUP_COUNT = 5
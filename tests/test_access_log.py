@@ -0,0 +1,114 @@
+import json
+import os
+import queue
+
+import pytest
+from werkzeug.test import Client
+
+from yacut import access_logger
+from yacut.access_log import AccessLogger, process_log_path
+from yacut.redirect_app import RedirectDispatcher
+
+
+@pytest.fixture
+def access_log_path(_app, tmp_path):
+    path = tmp_path / 'access.log'
+    _app.config.update({
+        'ACCESS_LOG_PATH': str(path),
+        'ACCESS_LOG_SAMPLE_RATE': 1.0,
+    })
+    yield path
+    access_logger.stop()
+    _app.config['ACCESS_LOG_PATH'] = None
+
+
+def read_records(path):
+    access_logger.stop()
+    path = process_log_path(str(path))
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_redirects_logged(client, short_python_url, access_log_path):
+    client.get(f'/{short_python_url.short}')
+    client.get('/missing')
+    records = read_records(access_log_path)
+    assert [(r['short'], r['status']) for r in records] == [
+        ('py', 302), ('missing', 404)
+    ], 'Каждый переход должен попадать в журнал со своим статусом.'
+    assert all(
+        r['latency_ms'] >= 0 and r['tier'] == 'flask' for r in records
+    )
+
+
+def test_tier_redirects_logged(_app, short_python_url, access_log_path):
+    tier = Client(RedirectDispatcher(_app))
+    tier.get(f'/{short_python_url.short}')
+    tier.get(f'/{short_python_url.short}')
+    records = read_records(access_log_path)
+    assert [(r['tier'], r['cache']) for r in records] == [
+        ('wsgi', 'miss'), ('wsgi', 'hit')
+    ], 'Журнал должен отражать попадания в кеш.'
+
+
+def test_sampling_keeps_errors(client, short_python_url, access_log_path):
+    client.application.config['ACCESS_LOG_SAMPLE_RATE'] = 0.0
+    client.get(f'/{short_python_url.short}')
+    client.get('/missing')
+    records = read_records(access_log_path)
+    assert [r['status'] for r in records] == [404], (
+        'Выборка должна отбрасывать только успешные переходы.'
+    )
+
+
+def test_queue_overflow_drops(tmp_path):
+    logger = AccessLogger()
+    logger._queue = queue.Queue(maxsize=1)
+    logger._listener = object()
+    logger._pid = os.getpid()
+    config = {'ACCESS_LOG_PATH': str(tmp_path), 'ACCESS_LOG_SAMPLE_RATE': 1}
+    for _ in range(3):
+        logger.log(config, 'py', 302, 0.001, None, 'flask')
+    assert logger.stats() == {'logged': 1, 'dropped': 2, 'sampled_out': 0}, (
+        'При переполнении очереди записи должны отбрасываться без '
+        'блокировки и учитываться в счётчике.'
+    )
+
+
+def test_log_file_per_process(client, short_python_url, access_log_path):
+    client.get(f'/{short_python_url.short}')
+    access_logger.stop()
+    assert not access_log_path.exists()
+    assert access_log_path.with_name(f'access.{os.getpid()}.log').exists(), (
+        'Каждый процесс должен писать журнал в собственный файл.'
+    )
+
+
+def test_restarts_after_fork(tmp_path):
+    logger = AccessLogger()
+    config = {
+        'ACCESS_LOG_PATH': str(tmp_path / 'access.log'),
+        'ACCESS_LOG_SAMPLE_RATE': 1,
+        'ACCESS_LOG_QUEUE_SIZE': 10,
+        'ACCESS_LOG_MAX_BYTES': 1024,
+        'ACCESS_LOG_BACKUP_COUNT': 1,
+    }
+    logger.log(config, 'py', 302, 0.001, None, 'flask')
+    inherited = logger._listener
+    logger._pid = -1
+    logger.log(config, 'py', 302, 0.001, None, 'flask')
+    assert logger._listener is not inherited, (
+        'После fork процесс должен запускать собственный поток записи.'
+    )
+    inherited.stop()
+    inherited.handlers[0].close()
+    logger.stop()
+
+
+def test_counters_in_readyz(client, short_python_url, access_log_path):
+    client.application.config['ACCESS_LOG_SAMPLE_RATE'] = 0.0
+    client.get(f'/{short_python_url.short}')
+    stats = client.get('/-/readyz').json['access_log']
+    assert stats['sampled_out'] >= 1 and 'dropped' in stats, (
+        'Счётчики журнала переходов должны быть видны в /-/readyz.'
+    )
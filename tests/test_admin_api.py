@@ -0,0 +1,169 @@
+import json
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+
+from yacut import db
+from yacut.models import URLMap
+
+ADMIN_KEY = 'admin-secret'
+LIST_URL = '/api/admin/urls/'
+HEADERS = {'X-API-Key': ADMIN_KEY}
+
+
+@pytest.fixture
+def admin_app(_app):
+    _app.config['ADMIN_API_KEY'] = ADMIN_KEY
+    yield _app
+    _app.config['ADMIN_API_KEY'] = None
+
+
+@pytest.fixture
+def urlmaps(admin_app):
+    start = datetime(2024, 1, 1)
+    objects = [
+        URLMap(
+            original=f'https://example.com/{index}',
+            short=f'{prefix}{index}',
+            timestamp=start + timedelta(days=index)
+        )
+        for index, prefix in enumerate(['ab', 'ab', 'cd', 'ab', 'cd'])
+    ]
+    db.session.add_all(objects)
+    db.session.commit()
+    return objects
+
+
+def test_list_requires_admin_key(client, admin_app):
+    response = client.get(LIST_URL, headers={'X-API-Key': 'wrong'})
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        'Административное API должно быть недоступно без верного ключа.'
+    )
+
+
+def test_list_keyset_pagination(client, urlmaps):
+    seen = []
+    cursor = None
+    while True:
+        params = {'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(LIST_URL, query_string=params, headers=HEADERS)
+        assert response.status_code == HTTPStatus.OK
+        seen.extend(item['id'] for item in response.json['items'])
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+    assert seen == sorted((obj.id for obj in urlmaps), reverse=True), (
+        'Постраничный обход по курсору должен вернуть все записи от новых '
+        'к старым без повторов.'
+    )
+
+
+def test_list_filters(client, urlmaps):
+    response = client.get(LIST_URL, headers=HEADERS, query_string={
+        'prefix': 'ab',
+        'created_from': '2024-01-02T00:00:00',
+        'created_to': '2024-01-05T00:00:00+00:00',
+    })
+    assert [item['short'] for item in response.json['items']] == [
+        'ab3', 'ab1'
+    ], 'Фильтры по префиксу и времени создания работают некорректно.'
+
+
+def test_list_invalid_params(client, admin_app):
+    response = client.get(
+        LIST_URL, headers=HEADERS, query_string={'created_from': 'yesterday'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    for params in ({'limit': '²'}, {'limit': '0'},
+                   {'cursor': '99999999999999999999'}):
+        response = client.get(LIST_URL, headers=HEADERS, query_string=params)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Некорректный параметр {params} должен возвращать 400.'
+        )
+
+
+def test_list_ndjson(client, urlmaps):
+    response = client.get(
+        LIST_URL, headers=HEADERS, query_string={'format': 'ndjson'}
+    )
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.data.decode().splitlines()
+    assert len(lines) == len(urlmaps), (
+        'В формате NDJSON каждая запись должна быть отдельной строкой.'
+    )
+    assert json.loads(lines[0])['short'] == urlmaps[-1].short
+
+
+def test_changes_feed(client, urlmaps):
+    ids = []
+    cursor = 0
+    has_more = True
+    while has_more:
+        response = client.get(
+            '/api/admin/changes/', headers=HEADERS,
+            query_string={'since': cursor, 'limit': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        ids.extend(item['id'] for item in response.json['items'])
+        cursor = response.json['cursor']
+        has_more = response.json['has_more']
+    assert ids == sorted(obj.id for obj in urlmaps), (
+        'Лента изменений должна вернуть все записи по возрастанию `id`.'
+    )
+    response = client.get(
+        '/api/admin/changes/', headers=HEADERS,
+        query_string={'since': cursor}
+    )
+    assert response.json == {'items': [], 'cursor': cursor,
+                              'has_more': False}
+
+
+def test_changes_feed_holds_back_fresh_records(client, urlmaps):
+    db.session.add(URLMap(original='https://example.com/new', short='new'))
+    db.session.commit()
+    response = client.get('/api/admin/changes/', headers=HEADERS)
+    assert [item['short'] for item in response.json['items']] == [
+        obj.short for obj in urlmaps
+    ], (
+        'Записи моложе CHANGES_SAFETY_LAG не должны попадать в ленту: '
+        'иначе курсор может перескочить через незафиксированную запись.'
+    )
+    for since in ('²', '99999999999999999999'):
+        response = client.get(
+            '/api/admin/changes/', headers=HEADERS,
+            query_string={'since': since}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_changes_feed_stops_at_unsettled_record(client, admin_app):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.session.add_all([
+        URLMap(original='https://example.com/1', short='first',
+               timestamp=now - timedelta(seconds=4.9)),
+        URLMap(original='https://example.com/2', short='second',
+               timestamp=now - timedelta(seconds=5.1)),
+    ])
+    db.session.commit()
+    response = client.get('/api/admin/changes/', headers=HEADERS)
+    assert response.json['items'] == [] and response.json['cursor'] == 0, (
+        'Лента должна останавливаться на первой неустоявшейся записи, '
+        'даже если следующая за ней уже устоялась.'
+    )
+    URLMap.query.filter_by(short='first').update({'timestamp': None})
+    db.session.commit()
+    response = client.get('/api/admin/changes/', headers=HEADERS)
+    assert response.json['items'] == [], (
+        'Запись без времени создания не должна пропускаться курсором.'
+    )
+
+
+def test_changes_cli(cli_runner, urlmaps):
+    result = cli_runner.invoke(args=['changes', '--since', urlmaps[2].id])
+    lines = result.stdout.splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [
+        urlmaps[3].id, urlmaps[4].id
+    ]
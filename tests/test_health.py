@@ -0,0 +1,121 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from yacut import db, resolution_cache
+from yacut.health import readiness
+from yacut.snapshot import write_snapshot
+
+
+@pytest.fixture
+def warm_up_config(_app):
+    _app.config['REDIRECT_PRECOMPILED'] = True
+    _app.config['RESOLUTION_CACHE_WARMUP'] = 10
+    resolution_cache.clear()
+    readiness.reset()
+    yield _app
+    _app.config['REDIRECT_PRECOMPILED'] = False
+    _app.config['RESOLUTION_CACHE_WARMUP'] = 0
+    resolution_cache.clear()
+    readiness.reset()
+
+
+def test_healthz(client):
+    response = client.get('/-/healthz')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {'status': 'ok'}
+
+
+def test_probes_do_not_shadow_short_ids(client):
+    response = client.post(
+        '/api/id/', json={'url': 'https://www.python.org',
+                          'custom_id': 'healthz'}
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    redirect = client.get('/healthz')
+    assert redirect.status_code == HTTPStatus.FOUND, (
+        'Проверки живости не должны занимать пространство коротких ссылок.'
+    )
+
+
+def test_readyz(client):
+    readiness.reset()
+    response = client.get('/-/readyz')
+    assert response.status_code == HTTPStatus.OK, (
+        'Узел без прогрева кеша должен быть готов при доступной базе.'
+    )
+    assert response.json['database'] == {'ok': True, 'error': None}
+    assert 'class' in response.json['pool']
+
+
+def test_readyz_waits_for_warm_up(client, warm_up_config, short_python_url):
+    response = client.get('/-/readyz')
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE, (
+        'Пока кеш не прогрет, узел не должен принимать трафик.'
+    )
+    assert response.json['cache']['warm'] is False
+    warm_up_thread = readiness._warm_up_thread
+    if warm_up_thread is not None:
+        warm_up_thread.join(timeout=5)
+    response = client.get('/-/readyz')
+    assert response.status_code == HTTPStatus.OK
+    assert response.json['cache']['entries'] == 1
+    client.get(f'/{short_python_url.short}')
+    assert resolution_cache.hits == 1, (
+        'Прогретая ссылка должна обслуживаться из кеша.'
+    )
+
+
+def test_readyz_probe_does_not_block(client, monkeypatch):
+    readiness.reset()
+    client.get('/-/readyz')
+    released = threading.Event()
+    entered = threading.Event()
+
+    def hanging_connect(*args, **kwargs):
+        entered.set()
+        released.wait(5)
+        raise OperationalError('SELECT 1', {}, Exception('timeout'))
+
+    def probe():
+        with client.application.app_context():
+            readiness.database_error(0)
+
+    monkeypatch.setattr(db.engine, 'connect', hanging_connect)
+    readiness._db_checked_at = None
+    prober = threading.Thread(target=probe)
+    prober.start()
+    entered.wait(5)
+    try:
+        response = client.get('/-/readyz')
+        assert response.status_code == HTTPStatus.OK, (
+            'Пока одна проверка ждёт базу, остальные должны сразу '
+            'получать результат предыдущей.'
+        )
+    finally:
+        released.set()
+        prober.join()
+    assert client.get('/-/readyz').json['database']['ok'] is False
+    readiness.reset()
+
+
+def test_readyz_snapshot_node_without_database(client, monkeypatch,
+                                               tmp_path):
+    snapshot_path = str(tmp_path / 'urlmap.snap')
+    write_snapshot(snapshot_path, [('edge', 'https://edge.example.com')])
+
+    def failing_connect(*args, **kwargs):
+        raise OperationalError('SELECT 1', {}, Exception('down'))
+
+    monkeypatch.setattr(db.engine, 'connect', failing_connect)
+    client.application.config['URLMAP_SNAPSHOT_PATH'] = snapshot_path
+    try:
+        response = client.get('/-/readyz')
+    finally:
+        client.application.config['URLMAP_SNAPSHOT_PATH'] = None
+    assert response.status_code == HTTPStatus.OK, (
+        'Узел со снимком не должен зависеть от доступности базы данных.'
+    )
+    assert response.json['snapshot']['records'] == 1
@@ -0,0 +1,100 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+from yacut import db, index_audit
+from yacut.index_audit import (audit_queries, filter_columns,
+                               missing_model_indexes)
+from yacut.models import URLMap
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+
+
+def test_no_full_scans(_app):
+    with db.engine.connect() as connection:
+        reports = audit_queries(connection)
+    assert reports and not [r.shape.name for r in reports if r.full_scans], (
+        'Типовые запросы приложения не должны просматривать таблицы '
+        'целиком.'
+    )
+    assert missing_model_indexes(db.engine) == []
+
+
+def test_missing_index_detected(_app, cli_runner):
+    db.session.execute(text('DROP INDEX ix_url_map_timestamp'))
+    db.session.commit()
+    assert missing_model_indexes(db.engine) == ['url_map(timestamp)']
+    result = cli_runner.invoke(args=['audit_indexes'])
+    assert result.exit_code == 1, (
+        'При отсутствии индекса команда должна завершаться с ошибкой.'
+    )
+    assert 'url_map(timestamp)' in result.output
+    assert '[ПОЛНЫЙ ПРОСМОТР] admin listing by time range' in result.output
+    assert 'CREATE INDEX ix_url_map_timestamp' in result.output
+
+
+def test_creation_shapes_audited(_app):
+    with db.engine.connect() as connection:
+        reports = {
+            report.shape.name: report
+            for report in audit_queries(connection)
+        }
+    creation = [name for name in reports if name.startswith('creation')]
+    assert len(creation) == 2 and all(
+        reports[name].analysed and not reports[name].full_scans
+        for name in creation
+    ), 'Запросы раздела при создании ссылки должны использовать индексы.'
+
+
+def test_unsupported_dialect_not_passed(cli_runner, _app, monkeypatch):
+    monkeypatch.setattr(index_audit, 'ANALYSED_DIALECTS', ())
+    result = cli_runner.invoke(args=['audit_indexes'])
+    assert '[ПЛАН НЕ РАЗОБРАН]' in result.output and '[ok]' not in (
+        result.output
+    ), 'План СУБД, который не разбирается, не должен считаться успешным.'
+    assert result.exit_code == 1
+
+
+def test_suggestion_skips_primary_key(_app):
+    query = URLMap.get_changes_query(1000)
+    assert filter_columns(query, ['url_map']) == ['url_map.timestamp'], (
+        'Индекс по первичному ключу не должен предлагаться.'
+    )
+
+
+def test_generate_adds_only_missing_indexes(tmp_path):
+    shutil.copytree(BASE_DIR / 'migrations', tmp_path / 'migrations')
+    database_path = tmp_path / 'audit.sqlite3'
+    env = dict(
+        os.environ, FLASK_APP='yacut', PYTHONPATH=str(BASE_DIR),
+        DATABASE_URI=f'sqlite:///{database_path}'
+    )
+
+    def flask(*args):
+        return subprocess.run(
+            [sys.executable, '-m', 'flask', *args],
+            cwd=tmp_path, env=env, capture_output=True, text=True
+        )
+
+    assert flask('db', 'upgrade').returncode == 0
+    connection = sqlite3.connect(database_path)
+    connection.execute('DROP INDEX ix_url_map_timestamp')
+    connection.execute('CREATE TABLE unrelated (id INTEGER PRIMARY KEY)')
+    connection.commit()
+    connection.close()
+    versions = tmp_path / 'migrations' / 'versions'
+    before = set(versions.glob('*.py'))
+    flask('audit_indexes', '--generate')
+    created = set(versions.glob('*.py')) - before
+    assert len(created) == 1, 'Должна создаваться одна миграция.'
+    script = created.pop().read_text(encoding='utf-8')
+    assert 'ix_url_map_timestamp' in script
+    assert 'unrelated' not in script, (
+        'Миграция для индексов не должна захватывать другие изменения '
+        'схемы.'
+    )
@@ -0,0 +1,159 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from yacut import db
+from yacut.link_checker import LinkChecker, is_public_address
+from yacut.models import LinkCheck, URLMap
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    routes = {
+        '/ok': HTTPStatus.OK,
+        '/ok?page=2': HTTPStatus.OK,
+        '/dead': HTTPStatus.NOT_FOUND,
+        '/head-not-allowed': HTTPStatus.OK,
+    }
+
+    def _respond(self, status):
+        self.server.clients.add(self.client_address)
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.path == '/head-not-allowed':
+            return self._respond(HTTPStatus.METHOD_NOT_ALLOWED)
+        self._respond(self.routes.get(self.path, HTTPStatus.NOT_FOUND))
+
+    def do_GET(self):
+        self._respond(self.routes.get(self.path, HTTPStatus.NOT_FOUND))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.clients = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def allow_private(_app):
+    _app.config['LINK_CHECK_ALLOW_PRIVATE'] = True
+    yield
+    _app.config['LINK_CHECK_ALLOW_PRIVATE'] = False
+
+
+@pytest.fixture
+def stored_links(_app, stub_server, allow_private):
+    base = f'http://127.0.0.1:{stub_server.server_port}'
+    links = {
+        'ok': f'{base}/ok',
+        'okpage': f'{base}/ok?page=2',
+        'dead': f'{base}/dead',
+        'nohead': f'{base}/head-not-allowed',
+        'refused': 'http://127.0.0.1:1/',
+        'ftp': 'ftp://example.com/file',
+    }
+    db.session.add_all(
+        URLMap(original=original, short=short)
+        for short, original in links.items()
+    )
+    db.session.commit()
+    return links
+
+
+def get_check(short):
+    return URLMap.query.filter_by(short=short).first().link_check
+
+
+def test_link_checker_statuses(stored_links, stub_server):
+    stats = LinkChecker(workers=2, batch_size=4, timeout=2).run()
+    assert stats == {'checked': 6, 'dead': 3}
+    assert get_check('ok').is_alive and get_check('okpage').is_alive
+    assert get_check('nohead').status_code == HTTPStatus.OK, (
+        'Если HEAD не поддерживается, ссылку нужно проверить методом GET.'
+    )
+    dead = get_check('dead')
+    assert not dead.is_alive and dead.status_code == HTTPStatus.NOT_FOUND
+    refused = get_check('refused')
+    assert not refused.is_alive and refused.error, (
+        'Сетевая ошибка должна сохраняться в результате проверки.'
+    )
+    assert not get_check('ftp').is_alive
+    assert len(stub_server.clients) == 1, (
+        'Ссылки одного хоста должны проверяться через одно соединение.'
+    )
+
+
+def test_link_checker_backoff(stored_links):
+    checker = LinkChecker(timeout=2)
+    checker.run()
+    assert checker.run() == {'checked': 0, 'dead': 0}, (
+        'Повторный запуск не должен проверять ссылки раньше срока.'
+    )
+    dead = get_check('dead')
+    dead.next_check_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.session.commit()
+    checker.run()
+    dead = get_check('dead')
+    assert dead.failures == 2
+    assert (
+        dead.next_check_at - dead.checked_at
+        == LinkChecker.next_check_delay(2)
+        > LinkChecker.next_check_delay(1)
+    ), 'Интервал перепроверки недоступной ссылки должен расти.'
+    assert LinkCheck.query.count() == len(stored_links)
+
+
+def test_link_checker_invalid_host(_app):
+    db.session.add(URLMap(original=f'http://{"a" * 64}.com/', short='idna'))
+    db.session.commit()
+    assert LinkChecker(timeout=2).run() == {'checked': 1, 'dead': 1}, (
+        'Некорректный адрес должен учитываться как недоступная ссылка, '
+        'а не прерывать проверку.'
+    )
+    assert get_check('idna').error.startswith('UnicodeError')
+
+
+@pytest.mark.parametrize('address, public', [
+    ('127.0.0.1', False),
+    ('169.254.169.254', False),
+    ('10.1.2.3', False),
+    ('192.168.0.1', False),
+    ('::1', False),
+    ('::ffff:127.0.0.1', False),
+    ('fe80::1%eth0', False),
+    ('8.8.8.8', True),
+    ('2001:4860:4860::8888', True),
+])
+def test_is_public_address(address, public):
+    assert is_public_address(address) is public
+
+
+def test_link_checker_skips_private_addresses(_app, stub_server):
+    port = stub_server.server_port
+    db.session.add_all([
+        URLMap(original=f'http://127.0.0.1:{port}/ok', short='local'),
+        URLMap(original=f'http://localhost:{port}/ok', short='named'),
+        URLMap(original='http://169.254.169.254/latest/', short='meta'),
+    ])
+    db.session.commit()
+    assert LinkChecker(timeout=2).run() == {'checked': 3, 'dead': 3}
+    assert {
+        get_check(short).error for short in ('local', 'named', 'meta')
+    } == {'Неподдерживаемый адрес'}
+    assert not stub_server.clients, (
+        'Проверка не должна обращаться к непубличным адресам.'
+    )
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+BASELINE_REVISION = '3f1c2a9d8b10'
+
+
+def flask_db(database_path, *args):
+    env = dict(
+        os.environ, FLASK_APP='yacut',
+        DATABASE_URI=f'sqlite:///{database_path}'
+    )
+    return subprocess.run(
+        [sys.executable, '-m', 'flask', 'db', *args],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def test_upgrade_database_created_before_migrations(tmp_path):
+    database_path = tmp_path / 'old.sqlite3'
+    connection = sqlite3.connect(database_path)
+    connection.execute(
+        'CREATE TABLE url_map (id INTEGER NOT NULL, '
+        'original VARCHAR(256) NOT NULL, short VARCHAR(16) NOT NULL, '
+        'timestamp DATETIME, PRIMARY KEY (id), UNIQUE (short))'
+    )
+    connection.commit()
+    flask_db(database_path, 'stamp', BASELINE_REVISION)
+    flask_db(database_path, 'upgrade')
+    indexes = {
+        row[1] for row in connection.execute('PRAGMA index_list(url_map)')
+    }
+    connection.close()
+    assert 'ix_url_map_timestamp' in indexes, (
+        'Миграции должны добавлять в существующую таблицу новые индексы '
+        'модели URLMap.'
+    )
@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from yacut import db
+from yacut.models import ShortIDPartition, URLMap, partitioned_generator
+from yacut.partitions import PARTITION_SIZE, partition_key, permute_offset
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+PY_URL = 'https://www.python.org'
+PROCESSES = 4
+LINKS_PER_PROCESS = 60
+WORKER_SCRIPT = '''
+import json, sys
+from sqlalchemy.exc import SQLAlchemyError
+from yacut import app
+from yacut.models import URLMap
+app.config['SHORT_ID_PARTITIONED'] = True
+created, errors = [], 0
+with app.app_context():
+    for index in range(int(sys.argv[1])):
+        try:
+            created.append(URLMap.create_urlmap(f'https://e.com/{index}').short)
+        except SQLAlchemyError:
+            errors += 1
+print(json.dumps({'created': created, 'errors': errors}))
+'''
+
+
+@pytest.fixture
+def partitioned(_app):
+    _app.config['SHORT_ID_PARTITIONED'] = True
+    partitioned_generator._reset()
+    yield
+    _app.config['SHORT_ID_PARTITIONED'] = False
+    partitioned_generator._reset()
+
+
+def test_partitioned_ids_share_prefix(partitioned):
+    shorts = {URLMap.create_urlmap(PY_URL).short for _ in range(20)}
+    assert len(shorts) == 20
+    prefix = ShortIDPartition.query.one().prefix
+    assert all(len(s) == 6 and s.startswith(prefix) for s in shorts), (
+        'Все ID процесса должны принадлежать его разделу.'
+    )
+
+
+def test_stale_partition_taken_over(partitioned):
+    first = URLMap.create_urlmap(PY_URL).short
+    partitioned_generator._reset()
+    db.session.query(ShortIDPartition).update({
+        'owner': 'dead-host:1',
+        'next_offset': 0,
+        'heartbeat_at': datetime.now(timezone.utc) - timedelta(days=2),
+    })
+    db.session.commit()
+    second = URLMap.create_urlmap(PY_URL).short
+    assert second != first and second[:2] == first[:2], (
+        'Раздел с просроченной арендой должен перехватываться, а уже '
+        'занятые ID — пропускаться.'
+    )
+
+
+def test_no_collisions_across_processes(tmp_path):
+    database = tmp_path / 'stress.sqlite3'
+    env = dict(
+        os.environ,
+        DATABASE_URI=f'sqlite:///{database}',
+        PYTHONPATH=str(BASE_DIR),
+    )
+    subprocess.run(
+        [sys.executable, '-c', 'from yacut import app, db\n'
+         'with app.app_context():\n    db.create_all()'],
+        env=env, check=True
+    )
+    workers = [
+        subprocess.Popen(
+            [sys.executable, '-c', WORKER_SCRIPT, str(LINKS_PER_PROCESS)],
+            env=env, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(PROCESSES)
+    ]
+    results = [json.loads(worker.communicate()[0]) for worker in workers]
+    created = [short for result in results for short in result['created']]
+    assert sum(result['errors'] for result in results) == 0, (
+        'Параллельное создание ссылок не должно приводить к ошибкам '
+        'уникальности.'
+    )
+    assert len(created) == len(set(created)) == PROCESSES * LINKS_PER_PROCESS
+    for result in results:
+        assert len({short[:2] for short in result['created']}) == 1, (
+            'Каждый процесс должен работать в собственном разделе.'
+        )
+
+
+def test_offset_permutation_keyed():
+    key = partition_key('secret', 'ab')
+    offsets = range(0, PARTITION_SIZE, 997)
+    permuted = [permute_offset(offset, key) for offset in offsets]
+    assert len(set(permuted)) == len(permuted), (
+        'Перестановка смещений должна быть биекцией.'
+    )
+    assert all(0 <= value < PARTITION_SIZE for value in permuted)
+    other_key = partition_key('another-secret', 'ab')
+    assert permuted != [permute_offset(o, other_key) for o in offsets], (
+        'Перестановка должна зависеть от SECRET_KEY.'
+    )
+
+
+def test_partition_released(partitioned):
+    first = URLMap.create_urlmap(PY_URL).short
+    partitioned_generator.release()
+    partition = ShortIDPartition.query.one()
+    assert partition.heartbeat_at < datetime(2000, 1, 1), (
+        'Освобождённый раздел должен сразу считаться просроченным.'
+    )
+    second = URLMap.create_urlmap(PY_URL).short
+    assert ShortIDPartition.query.count() == 1 and second[:2] == first[:2], (
+        'Освобождённый раздел должен переиспользоваться, а не '
+        'регистрироваться новый.'
+    )
@@ -0,0 +1,164 @@
+from http import HTTPStatus
+
+import pytest
+from werkzeug.test import Client
+
+from yacut import limiter, resolution_cache
+from yacut.rate_limit import MemoryBackend, SQLiteBackend, scope_path
+from yacut.redirect_app import RedirectDispatcher
+
+PY_URL = 'https://www.python.org'
+CREATE_SHORT_LINK_URL = '/api/id/'
+
+
+@pytest.fixture
+def rate_limited(_app):
+    _app.config.update({
+        'RATELIMIT_ENABLED': True,
+        'RATELIMIT_BACKEND': 'memory',
+        'RATELIMIT_CREATE': (2, 0.01),
+        'RATELIMIT_RESOLVE': (100, 10.0),
+        'RATELIMIT_API_KEYS': frozenset({'first', 'second'}),
+    })
+    limiter.reset()
+    yield _app
+    _app.config['RATELIMIT_ENABLED'] = False
+    limiter.reset()
+
+
+def test_create_rate_limited(client, rate_limited, short_python_url):
+    for _ in range(2):
+        response = client.post(CREATE_SHORT_LINK_URL, json={'url': PY_URL})
+        assert response.status_code == HTTPStatus.CREATED
+    response = client.post(CREATE_SHORT_LINK_URL, json={'url': PY_URL})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        'После исчерпания бюджета создание ссылок должно возвращать '
+        f'статус-код {HTTPStatus.TOO_MANY_REQUESTS.value}.'
+    )
+    assert int(response.headers['Retry-After']) >= 1, (
+        'Ответ 429 должен содержать заголовок `Retry-After`.'
+    )
+    assert 'message' in response.json
+    redirect = client.get(f'/{short_python_url.short}')
+    assert redirect.status_code == HTTPStatus.FOUND, (
+        'Исчерпание бюджета на создание не должно влиять на переходы '
+        'по коротким ссылкам.'
+    )
+
+
+def test_rate_limit_per_api_key(client, rate_limited):
+    for api_key in ('first', 'first', 'second'):
+        response = client.post(
+            CREATE_SHORT_LINK_URL,
+            json={'url': PY_URL},
+            headers={'X-API-Key': api_key}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Бюджеты разных API-ключей должны учитываться раздельно.'
+        )
+
+
+def test_rate_limit_ignores_unknown_api_keys(client, rate_limited):
+    statuses = [
+        client.post(
+            CREATE_SHORT_LINK_URL,
+            json={'url': PY_URL},
+            headers={'X-API-Key': f'random-{index}'}
+        ).status_code
+        for index in range(3)
+    ]
+    assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+        'Неизвестный API-ключ не должен давать отдельный бюджет.'
+    )
+
+
+def test_rate_limit_per_client_ip(client, rate_limited):
+    for address in ('10.0.0.1', '10.0.0.1', '10.0.0.2'):
+        response = client.post(
+            CREATE_SHORT_LINK_URL,
+            json={'url': PY_URL},
+            environ_base={'REMOTE_ADDR': address}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Бюджеты разных IP-адресов должны учитываться раздельно.'
+        )
+
+
+def test_form_get_not_limited(client, rate_limited):
+    for _ in range(3):
+        assert client.get('/').status_code == HTTPStatus.OK, (
+            'Отображение формы не должно расходовать бюджет на создание.'
+        )
+
+
+def test_redirect_tier_rate_limited(rate_limited, short_python_url):
+    rate_limited.config['RATELIMIT_RESOLVE'] = (2, 0.01)
+    resolution_cache.clear()
+    tier = Client(RedirectDispatcher(rate_limited))
+    statuses = [
+        tier.get(f'/{short_python_url.short}').status_code
+        for _ in range(3)
+    ]
+    resolution_cache.clear()
+    assert statuses == [
+        HTTPStatus.FOUND, HTTPStatus.FOUND, HTTPStatus.TOO_MANY_REQUESTS
+    ], 'Уровень переходов должен расходовать бюджет `resolve`.'
+    response = tier.get(
+        f'/{short_python_url.short}',
+        environ_base={'REMOTE_ADDR': '10.0.0.9'}
+    )
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Бюджет уровня переходов должен учитываться по адресу клиента.'
+    )
+
+
+def test_sqlite_backend_shared(tmp_path):
+    path = str(tmp_path / 'ratelimit.sqlite3')
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    assert first.consume('create:client', 2, 0.01) == 0
+    assert second.consume('create:client', 2, 0.01) == 0
+    assert first.consume('create:client', 2, 0.01) > 0, (
+        'Экземпляры SQLite-хранилища на одном файле должны разделять '
+        'бюджет.'
+    )
+    journal_mode = first._connection().execute(
+        'PRAGMA journal_mode'
+    ).fetchone()[0]
+    assert journal_mode == 'wal', (
+        'SQLite-хранилище должно работать в режиме WAL.'
+    )
+
+
+def test_sqlite_backend_file_per_scope(rate_limited, tmp_path):
+    path = str(tmp_path / 'ratelimit.sqlite3')
+    rate_limited.config.update({
+        'RATELIMIT_BACKEND': 'sqlite', 'RATELIMIT_SQLITE_PATH': path,
+    })
+    limiter.reset()
+    create = limiter.backend_for(rate_limited.config, 'create')
+    resolve = limiter.backend_for(rate_limited.config, 'resolve')
+    assert (create.path, resolve.path) == (
+        scope_path(path, 'create'), scope_path(path, 'resolve')
+    ), 'Группы должны хранить корзины в отдельных файлах.'
+    assert str(tmp_path / 'ratelimit.resolve.sqlite3') == resolve.path
+
+
+def test_memory_backend_bounded():
+    backend = MemoryBackend(max_keys=2)
+    for key in ('a', 'b', 'a', 'c'):
+        backend.consume(key, 1, 0.01)
+    assert len(backend) == 2
+    assert backend.consume('a', 1, 0.01) > 0, (
+        'При переполнении должна вытесняться давно не использованная '
+        'корзина.'
+    )
+
+
+def test_sqlite_backend_sweeps_full_buckets(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'ratelimit.sqlite3'))
+    backend.consume('resolve:fast', 100, 1e6)
+    backend.consume('create:slow', 2, 0.01)
+    assert backend.sweep() == 1, (
+        'Должны удаляться только наполнившиеся корзины, с учётом '
+        'параметров их группы.'
+    )
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event
+from werkzeug.test import Client
+
+from yacut import db, resolution_cache
+from yacut.redirect_app import RedirectDispatcher
+
+
+@pytest.fixture
+def tier_client(_app):
+    resolution_cache.clear()
+    yield Client(RedirectDispatcher(_app))
+    resolution_cache.clear()
+
+
+def test_tier_redirects(tier_client, short_python_url):
+    for _ in range(2):
+        response = tier_client.get(f'/{short_python_url.short}')
+        assert response.status_code == HTTPStatus.FOUND
+        assert response.location == short_python_url.original
+    assert (resolution_cache.hits, resolution_cache.misses) == (1, 1), (
+        'Повторный переход должен обслуживаться из кеша.'
+    )
+
+
+def test_tier_head(tier_client, short_python_url):
+    response = tier_client.head(f'/{short_python_url.short}')
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.data == b''
+
+
+def test_tier_falls_back_to_flask(tier_client, short_python_url):
+    response = tier_client.get('/missing')
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Несуществующие ссылки должны обрабатываться приложением Flask.'
+    )
+    assert 'Страница не найдена' in response.get_data(as_text=True)
+    assert tier_client.get('/').status_code == HTTPStatus.OK
+    response = tier_client.get(f'/api/id/{short_python_url.short}/')
+    assert response.json == {'url': short_python_url.original}
+    response = tier_client.post(f'/{short_python_url.short}')
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_tier_caches_missing_links(tier_client):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(3):
+            response = tier_client.get('/nosuch')
+            assert response.status_code == HTTPStatus.NOT_FOUND
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    assert len(statements) == 1, (
+        'Повторные запросы несуществующей ссылки не должны доходить до '
+        'базы данных ни на уровне WSGI, ни во Flask.'
+    )
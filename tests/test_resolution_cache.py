@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+
+from yacut import resolution_cache
+from yacut.resolution_cache import (NOT_FOUND, FrequencySketch,
+                                    PrecompiledRedirect, ResolutionCache,
+                                    TinyLFUCache)
+
+
+@pytest.fixture
+def precompiled(_app):
+    _app.config['REDIRECT_PRECOMPILED'] = True
+    resolution_cache.clear()
+    yield _app
+    _app.config['REDIRECT_PRECOMPILED'] = False
+    resolution_cache.clear()
+
+
+def test_precompiled_redirect_matches_plain(client, short_python_url):
+    plain = client.get(f'/{short_python_url.short}')
+    client.application.config['REDIRECT_PRECOMPILED'] = True
+    try:
+        for _ in range(2):
+            response = client.get(f'/{short_python_url.short}')
+            assert response.status_code == HTTPStatus.FOUND
+            assert response.location == short_python_url.original
+            assert response.data == plain.data
+            assert sorted(response.headers.items()) == sorted(
+                plain.headers.items()
+            ), 'Подготовленный ответ должен совпадать с обычным.'
+    finally:
+        client.application.config['REDIRECT_PRECOMPILED'] = False
+        resolution_cache.clear()
+
+
+def test_precompiled_redirect_cached(client, precompiled, short_python_url):
+    client.get(f'/{short_python_url.short}')
+    client.get(f'/{short_python_url.short}')
+    assert (resolution_cache.hits, resolution_cache.misses) == (1, 1), (
+        'Повторный переход должен обслуживаться из кеша.'
+    )
+    assert client.get('/missing').status_code == HTTPStatus.NOT_FOUND
+
+
+def test_resolution_cache_evicts_lru():
+    cache = ResolutionCache(maxsize=2, policy='lru')
+    for short in ('a', 'b'):
+        cache.put(short, PrecompiledRedirect('302 FOUND', [], b''))
+    cache.get('a')
+    cache.put('c', PrecompiledRedirect('302 FOUND', [], b''))
+    assert cache.get('b') is None and cache.get('a') is not None, (
+        'При переполнении должна вытесняться давно не использованная '
+        'запись.'
+    )
+
+
+def test_tinylfu_resists_scan():
+    cache = TinyLFUCache(maxsize=100)
+    popular = [f'hot{index}' for index in range(50)]
+    for _ in range(5):
+        for short in popular:
+            if cache.get(short) is None:
+                cache.put(short, short)
+    for index in range(1000):
+        short = f'scan{index}'
+        if cache.get(short) is None:
+            cache.put(short, short)
+    kept = sum(cache.get(short) is not None for short in popular)
+    assert kept >= 45, (
+        'Однократные обращения не должны вытеснять популярные записи.'
+    )
+    assert len(cache) <= 100
+
+
+def test_negative_cache_expires():
+    cache = ResolutionCache(maxsize=10, negative_maxsize=10,
+                            negative_ttl=0)
+    cache.put_not_found('gone')
+    assert cache.get('gone') is None, (
+        'Отметка об отсутствии ссылки должна истекать.'
+    )
+    cache = ResolutionCache(maxsize=10, negative_maxsize=10)
+    cache.put_not_found('gone')
+    assert cache.get('gone') is NOT_FOUND
+    assert cache.negative_hits == 1 and len(cache) == 0, (
+        'Отметки об отсутствии не должны занимать бюджет перенаправлений.'
+    )
+
+
+def test_negative_cache_forgotten_on_create(client, precompiled):
+    assert client.get('/later').status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/later').status_code == HTTPStatus.NOT_FOUND
+    assert resolution_cache.negative_hits == 1
+    client.post('/api/id/', json={
+        'url': 'https://example.com', 'custom_id': 'later'
+    })
+    assert client.get('/later').status_code == HTTPStatus.FOUND, (
+        'Созданная ссылка должна сразу обслуживаться, несмотря на '
+        'отметку в кеше.'
+    )
+
+
+def test_sketch_aging_halves_counters():
+    sketch = FrequencySketch(16)
+    for _ in range(9):
+        sketch.increment('hot')
+    sketch._additions = sketch._sample_size - 1
+    sketch.increment('hot')
+    assert sketch.estimate('hot') == 5, (
+        'При старении счётчики должны делиться пополам.'
+    )
+    assert isinstance(sketch._table, bytearray)
@@ -0,0 +1,23 @@
+import pytest
+
+from yacut.short_codec import key_to_short, short_to_key
+
+
+@pytest.mark.parametrize('short_id', ['aaaaaa', 'Zz09Ab', '999999'])
+def test_short_key_roundtrip(short_id):
+    key = short_to_key(short_id)
+    assert key is not None and key < 2 ** 63, (
+        'Идентификатор генерируемой длины должен декодироваться в '
+        '64-битное целое.'
+    )
+    assert key_to_short(key) == short_id, (
+        'Кодирование ключа должно возвращать исходный идентификатор.'
+    )
+
+
+@pytest.mark.parametrize('short_id', ['py', 'toolongid', 'abc-de'])
+def test_short_key_not_applicable(short_id):
+    assert short_to_key(short_id) is None, (
+        'Идентификаторы другой длины или с недопустимыми символами '
+        'не должны получать целочисленный ключ.'
+    )
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+
+from yacut import db
+from yacut import short_index as short_index_module
+from yacut.models import URLMap
+from yacut.short_index import short_index
+
+AVAILABILITY_URL = '/api/availability/{custom_id}/'
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(_app):
+    short_index.reset()
+    yield
+    short_index.reset()
+
+
+def test_available_name(client):
+    response = client.get(AVAILABILITY_URL.format(custom_id='free'))
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {
+        'custom_id': 'free', 'available': True, 'suggestions': []
+    }
+
+
+def test_taken_name_suggestions(client, short_python_url):
+    db.session.add_all([
+        URLMap(original='https://www.python.org', short=short)
+        for short in ('py1', 'py3')
+    ])
+    db.session.commit()
+    response = client.get(
+        AVAILABILITY_URL.format(custom_id='py'), query_string={'count': 3}
+    )
+    assert response.json['available'] is False
+    assert response.json['suggestions'] == ['py2', 'py4', 'py5'], (
+        'Для занятого имени должны предлагаться ближайшие свободные '
+        'варианты.'
+    )
+
+
+def test_index_updated_on_insert(client):
+    assert short_index.is_available('fresh')
+    client.post('/api/id/', json={
+        'url': 'https://www.python.org', 'custom_id': 'fresh'
+    })
+    assert not short_index.is_available('fresh'), (
+        'Индекс должен пополняться при создании новой ссылки.'
+    )
+
+
+def test_rolled_back_insert_not_indexed(client):
+    assert short_index.is_available('ghost')
+    db.session.add(URLMap(original='https://www.python.org', short='ghost'))
+    db.session.flush()
+    db.session.rollback()
+    assert short_index.is_available('ghost'), (
+        'Ссылка из откаченной транзакции не должна считаться занятой.'
+    )
+
+
+def test_large_table_falls_back_to_database(client, short_python_url,
+                                            monkeypatch):
+    monkeypatch.setattr(short_index_module, 'SHORT_INDEX_MAX_SIZE', 0)
+    db.session.add(URLMap(original='https://www.python.org', short='py1'))
+    db.session.commit()
+    assert not short_index.is_available('py'), (
+        'Без индекса в памяти занятость должна проверяться по базе данных.'
+    )
+    assert short_index.suggest('py', 2) == ['py2', 'py3']
+    assert short_index._shorts == [], (
+        'Для большой таблицы индекс в памяти не должен строиться.'
+    )
+
+
+def test_suggestion_fits_max_length(client):
+    long_name = 'a' * 16
+    db.session.add(URLMap(original='https://www.python.org', short=long_name))
+    db.session.commit()
+    response = client.get(AVAILABILITY_URL.format(custom_id=long_name))
+    assert all(len(s) <= 16 for s in response.json['suggestions']), (
+        'Предлагаемые варианты не должны превышать 16 символов.'
+    )
+
+
+def test_suggestions_unique(client):
+    name = 'a' * 14 + '1x'
+    db.session.add(URLMap(original='https://www.python.org', short=name))
+    db.session.commit()
+    suggestions = short_index.suggest(name, 11)
+    assert len(suggestions) == len(set(suggestions)) == 11, (
+        'Предлагаемые варианты не должны повторяться.'
+    )
+
+
+def test_names_taken_by_other_processes(client):
+    assert short_index.is_available('other')
+    db.session.execute(
+        URLMap.__table__.insert().values(
+            original='https://www.python.org', short='other'
+        )
+    )
+    db.session.execute(
+        URLMap.__table__.insert().values(
+            original='https://www.python.org', short='other1'
+        )
+    )
+    db.session.commit()
+    assert not short_index.is_available('other'), (
+        'Имя, занятое другим процессом, не должно считаться свободным.'
+    )
+    assert short_index.suggest('other', 1) == ['other2']
+
+
+def test_invalid_name(client):
+    response = client.get(AVAILABILITY_URL.format(custom_id='h@k'))
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_availability_invalid_count(client):
+    response = client.get(
+        AVAILABILITY_URL.format(custom_id='abc'), query_string={'count': '²'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST, (
+        'Некорректный параметр count должен возвращать 400.'
+    )
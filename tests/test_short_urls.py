@@ -0,0 +1,43 @@
+from flask import url_for
+
+from yacut import app
+from yacut.constants import SHORT_URL_PREFIX_CACHE_SIZE
+from yacut.models import URLMap
+from yacut.short_urls import _prefixes
+
+SHORT_URL_BASE = 'https://yac.ut/'
+
+
+def test_short_url_matches_url_for(_app):
+    urlmap = URLMap(original='https://www.python.org', short='py')
+    with _app.test_request_context(base_url='https://example.com'):
+        assert urlmap.get_short_url() == url_for(
+            'redirect_to_original', short='py', _external=True
+        ), 'Короткая ссылка должна совпадать с результатом `url_for`.'
+    with _app.test_request_context(base_url='http://other.host'):
+        assert urlmap.get_short_url() == 'http://other.host/py', (
+            'Префикс короткой ссылки должен кешироваться отдельно для '
+            'каждого хоста.'
+        )
+
+
+def test_short_url_base_outside_request(_app):
+    app.config['SHORT_URL_BASE'] = SHORT_URL_BASE
+    try:
+        urlmap = URLMap(original='https://www.python.org', short='py')
+        assert urlmap.get_short_url() == 'https://yac.ut/py', (
+            'Вне контекста запроса короткая ссылка должна строиться из '
+            '`SHORT_URL_BASE`.'
+        )
+    finally:
+        app.config['SHORT_URL_BASE'] = None
+
+
+def test_short_url_prefix_cache_bounded(_app):
+    urlmap = URLMap(original='https://www.python.org', short='py')
+    for index in range(SHORT_URL_PREFIX_CACHE_SIZE * 2):
+        with _app.test_request_context(base_url=f'http://host{index}'):
+            urlmap.get_short_url()
+    assert len(_prefixes) == SHORT_URL_PREFIX_CACHE_SIZE, (
+        'Кеш префиксов не должен расти с числом значений заголовка Host.'
+    )
@@ -0,0 +1,106 @@
+import os
+import random
+import string
+from http import HTTPStatus
+
+import pytest
+
+from yacut import db
+from yacut.models import URLMap
+from yacut.snapshot import (Snapshot, SnapshotFormatError, merge_snapshot,
+                            write_snapshot)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / 'urlmap.snap')
+
+
+def test_snapshot_lookup(snapshot_path):
+    shorts = sorted({
+        ''.join(random.choices(string.ascii_letters, k=random.randint(1, 16)))
+        for _ in range(500)
+    })
+    rows = [(short, f'https://example.com/{short}/ю') for short in shorts]
+    assert write_snapshot(snapshot_path, rows, high_water_id=42) == len(rows)
+    snapshot = Snapshot(snapshot_path)
+    assert len(snapshot) == len(rows) and snapshot.high_water_id == 42
+    for short, original in rows:
+        assert snapshot.lookup(short) == original, (
+            'Каждая запись снимка должна находиться по short.'
+        )
+    assert snapshot.lookup('0') is None
+    assert list(snapshot) == rows
+
+
+def test_snapshot_requires_sorted_rows(snapshot_path):
+    with pytest.raises(ValueError):
+        write_snapshot(snapshot_path, [('b', 'x'), ('a', 'y')])
+
+
+def test_snapshot_rejects_foreign_file(snapshot_path):
+    with open(snapshot_path, 'wb') as foreign:
+        foreign.write(b'not a snapshot at all, definitely not')
+    with pytest.raises(SnapshotFormatError):
+        Snapshot(snapshot_path)
+
+
+def test_truncated_snapshot_rejected(snapshot_path):
+    write_snapshot(snapshot_path, [('a', 'https://a.example.com')])
+    with open(snapshot_path, 'rb+') as snapshot:
+        snapshot.truncate(os.path.getsize(snapshot_path) - 10)
+    with pytest.raises(SnapshotFormatError):
+        Snapshot(snapshot_path)
+
+
+def test_export_and_serve_from_snapshot(client, cli_runner, short_python_url,
+                                        snapshot_path):
+    result = cli_runner.invoke(args=['export_snapshot', snapshot_path])
+    assert 'Выгружено записей: 1' in result.output
+    snapshot = Snapshot(snapshot_path)
+    assert snapshot.lookup('py') == short_python_url.original
+    write_snapshot(snapshot_path, [('edge', 'https://edge.example.com')])
+    client.application.config['URLMAP_SNAPSHOT_PATH'] = snapshot_path
+    try:
+        response = client.get('/edge')
+        assert response.status_code == HTTPStatus.FOUND, (
+            'При заданном снимке переходы должны обслуживаться из него.'
+        )
+        assert response.location == 'https://edge.example.com'
+        assert client.get('/py').status_code == HTTPStatus.NOT_FOUND, (
+            'При заданном снимке база данных не должна использоваться.'
+        )
+    finally:
+        client.application.config['URLMAP_SNAPSHOT_PATH'] = None
+
+
+def test_merge_snapshot(snapshot_path):
+    write_snapshot(snapshot_path, [('a', '1'), ('c', '3'), ('e', '5')], 3)
+    count = merge_snapshot(
+        snapshot_path, [('d', '4'), ('a', 'new'), ('f', '6'), ('0', '0')], 7
+    )
+    snapshot = Snapshot(snapshot_path)
+    assert count == 6 and snapshot.high_water_id == 7
+    assert list(snapshot) == [
+        ('0', '0'), ('a', 'new'), ('c', '3'), ('d', '4'), ('e', '5'),
+        ('f', '6')
+    ], 'Дельта должна сливаться со снимком с сохранением сортировки.'
+
+
+def test_sync_snapshot_from_db(_app, cli_runner, short_python_url,
+                               snapshot_path):
+    cli_runner.invoke(args=['export_snapshot', snapshot_path])
+    _app.config['CHANGES_SAFETY_LAG'] = 0
+    db.session.add(URLMap(original='https://flask.org', short='flask'))
+    db.session.commit()
+    result = cli_runner.invoke(args=['sync_snapshot', snapshot_path])
+    assert 'всего в снимке: 2' in result.output, (
+        'Свежие записи, выгруженные в снимок, должны повторно приходить '
+        'из ленты изменений без дублирования.'
+    )
+    snapshot = Snapshot(snapshot_path)
+    assert snapshot.lookup('flask') == 'https://flask.org'
+    assert snapshot.lookup('py') == short_python_url.original
+    result = cli_runner.invoke(args=['sync_snapshot', snapshot_path])
+    assert 'Новых записей нет' in result.output
+    _app.config['CHANGES_SAFETY_LAG'] = 5
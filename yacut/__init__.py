@@ -2,11 +2,35 @@ from flask import Flask
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from settings import Config
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from yacut.access_log import AccessLogger
+from yacut.rate_limit import RateLimiter
+from yacut.resolution_cache import ResolutionCache
 
 app = Flask(__name__)
 app.config.from_object(Config)
-
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
+limiter = RateLimiter(app)
+access_logger = AccessLogger(app)
+resolution_cache = ResolutionCache(
+    app.config['RESOLUTION_CACHE_SIZE'],
+    negative_maxsize=app.config['RESOLUTION_NEGATIVE_CACHE_SIZE'],
+    negative_ttl=app.config['RESOLUTION_NEGATIVE_TTL'],
+    policy=app.config['RESOLUTION_CACHE_POLICY'],
+)
+
+from yacut import (admin_api, api_views, cli_commands, error_handlers, health,
+                   redirect_app, views)
 
-from yacut import api_views, error_handlers, views
+if app.config['REDIRECT_TIER_ENABLED']:
+    redirect_app.mount_redirect_tier(app)
+# ProxyFix ставится последним, чтобы и уровень переходов видел реальный
+# адрес клиента
+if app.config['TRUSTED_PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(
+        app.wsgi_app,
+        x_for=app.config['TRUSTED_PROXY_COUNT'],
+        x_proto=app.config['TRUSTED_PROXY_COUNT'],
+    )
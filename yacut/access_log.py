@@ -0,0 +1,166 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+from logging.handlers import QueueListener, RotatingFileHandler
+from typing import Callable, Optional
+
+from flask import Flask, current_app, g
+
+
+def process_log_path(path: str, pid: Optional[int] = None) -> str:
+    """
+    Возвращает путь к файлу журнала конкретного процесса.
+
+    `RotatingFileHandler` небезопасен при записи в один файл из
+    нескольких процессов: при ротации они переименовывают файл друг у
+    друга и теряют записи. Поэтому каждый процесс пишет в свой файл:
+    `access.log` превращается в `access.<pid>.log`.
+    """
+    root, extension = os.path.splitext(path)
+    return f'{root}.{os.getpid() if pid is None else pid}{extension}'
+
+
+class JSONLineFormatter(logging.Formatter):
+    """Сериализует словарь из `record.msg` в одну строку JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, ensure_ascii=False)
+
+
+class AccessLogger:
+    """
+    Структурированный журнал переходов с неблокирующей записью.
+
+    Запись о переходе (short id, статус, задержка, попадание в кеш)
+    помещается в ограниченную очередь в памяти без ожидания; сериализация
+    и запись в файл с ротацией выполняются фоновым потоком
+    `QueueListener`. Каждый процесс пишет в собственный файл (см.
+    `process_log_path`). Если очередь переполнена, запись отбрасывается и
+    учитывается в счётчике `dropped`. Успешные переходы попадают в журнал
+    с вероятностью `ACCESS_LOG_SAMPLE_RATE`, ошибки — всегда.
+
+    Журнал отключён, пока не задан `ACCESS_LOG_PATH`.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.logged = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self._queue = None
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault('ACCESS_LOG_PATH', None)
+        app.extensions['access_logger'] = self
+        atexit.register(self.stop)
+
+    def _start(self, config) -> queue.Queue:
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                return self._queue
+            # После fork унаследованный поток записи в дочернем процессе
+            # не работает, а файл принадлежит родителю: запускаем свой.
+            handler = RotatingFileHandler(
+                process_log_path(config['ACCESS_LOG_PATH']),
+                maxBytes=config['ACCESS_LOG_MAX_BYTES'],
+                backupCount=config['ACCESS_LOG_BACKUP_COUNT'],
+                encoding='utf-8'
+            )
+            handler.setFormatter(JSONLineFormatter())
+            self._queue = queue.Queue(maxsize=config['ACCESS_LOG_QUEUE_SIZE'])
+            self._listener = QueueListener(self._queue, handler)
+            self._listener.start()
+            self._pid = os.getpid()
+            return self._queue
+
+    def stop(self) -> None:
+        """Дописывает очередь в файл и останавливает фоновый поток."""
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+            self._listener = None
+            self._queue = None
+
+    def log(self, config, short_id: str, status: int, latency: float,
+            cache: Optional[str], tier: str) -> None:
+        """
+        Ставит запись о переходе в очередь, не блокируя поток запроса.
+
+        Args:
+            config: Конфигурация приложения.
+            short_id (str): Короткий идентификатор.
+            status (int): HTTP-статус ответа.
+            latency (float): Время обработки в секундах.
+            cache (str, optional): 'hit', 'miss' или None, если кеш не
+                использовался.
+            tier (str): Обработавший уровень: 'flask' или 'wsgi'.
+        """
+        if not config['ACCESS_LOG_PATH']:
+            return
+        if (status < HTTPStatus.BAD_REQUEST
+                and random.random() >= config['ACCESS_LOG_SAMPLE_RATE']):
+            self.sampled_out += 1
+            return
+        with self._lock:
+            log_queue = self._queue if self._pid == os.getpid() else None
+        if log_queue is None:
+            log_queue = self._start(config)
+        record = logging.makeLogRecord({'msg': {
+            'ts': round(time.time(), 3),
+            'short': short_id,
+            'status': int(status),
+            'latency_ms': round(latency * 1000, 3),
+            'cache': cache,
+            'tier': tier,
+        }})
+        try:
+            log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.logged += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'logged': self.logged,
+            'dropped': self.dropped,
+            'sampled_out': self.sampled_out,
+        }
+
+    def track(self, view: Callable) -> Callable:
+        """
+        Декоратор представления перехода, записывающий его в журнал.
+
+        Попадание в кеш представление сообщает через `g.resolution_cache`.
+        """
+        @wraps(view)
+        def wrapper(short: str, *args, **kwargs):
+            started = time.perf_counter()
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            try:
+                response = view(short, *args, **kwargs)
+                status = response.status_code
+                return response
+            except Exception as error:
+                status = getattr(error, 'code', status)
+                raise
+            finally:
+                self.log(
+                    current_app.config, short, status,
+                    time.perf_counter() - started,
+                    g.get('resolution_cache'), 'flask'
+                )
+        return wrapper
@@ -0,0 +1,135 @@
+import hmac
+import json
+from functools import wraps
+from http import HTTPStatus
+from typing import Callable, Iterator
+
+from flask import Response, current_app, jsonify, request, stream_with_context
+
+from yacut import app
+from yacut.constants import (ADMIN_MAX_PAGE_SIZE, ADMIN_NDJSON_MAX_PAGE_SIZE,
+                             ADMIN_PAGE_SIZE, ADMIN_STREAM_BATCH_SIZE)
+from yacut.error_handlers import InvalidAPIUsage
+from yacut.models import URLMap
+from yacut.rate_limit import API_KEY_HEADER
+from yacut.validators import (parse_datetime, parse_non_negative_int,
+                              parse_positive_int, parse_short_prefix)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def admin_required(view: Callable) -> Callable:
+    """
+    Декоратор, пропускающий только запросы с ключом `ADMIN_API_KEY`.
+
+    Raises:
+        InvalidAPIUsage: Если ключ не настроен или не совпадает.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        admin_key = current_app.config['ADMIN_API_KEY']
+        request_key = request.headers.get(API_KEY_HEADER, '')
+        if not admin_key or not hmac.compare_digest(
+            request_key.encode(), admin_key.encode()
+        ):
+            raise InvalidAPIUsage('Доступ запрещён', HTTPStatus.FORBIDDEN)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def wants_ndjson() -> bool:
+    return (
+        request.args.get('format') == 'ndjson'
+        or request.accept_mimetypes.best == NDJSON_MIMETYPE
+    )
+
+
+def stream_ndjson(query) -> Response:
+    """
+    Отдаёт результат запроса построчно в формате NDJSON.
+
+    Записи читаются из базы пачками по `ADMIN_STREAM_BATCH_SIZE`, поэтому
+    потребление памяти не зависит от размера страницы.
+    """
+    def generate() -> Iterator[str]:
+        for urlmap in query.yield_per(ADMIN_STREAM_BATCH_SIZE):
+            yield json.dumps(urlmap.to_dict(), ensure_ascii=False) + '\n'
+
+    return Response(
+        stream_with_context(generate()), mimetype=NDJSON_MIMETYPE
+    )
+
+
+@app.route('/api/admin/urls/')
+@admin_required
+def list_urlmaps() -> Response:
+    """
+    Возвращает страницу записей URLMap, начиная с самых новых.
+
+    Параметры запроса: `cursor` (`id` последней записи предыдущей
+    страницы), `limit`, `created_from`/`created_to` (ISO 8601), `prefix`
+    (префикс короткой ссылки) и `format=ndjson`. В формате JSON ответ
+    содержит `items` и `next_cursor`; в формате NDJSON каждая строка —
+    запись, а курсором следующей страницы служит `id` последней строки.
+
+    Returns:
+        Response: Ответ в формате JSON или NDJSON.
+
+    Raises:
+        InvalidAPIUsage: При некорректных параметрах запроса.
+    """
+    ndjson = wants_ndjson()
+    limit = parse_positive_int(
+        request.args, 'limit', ADMIN_PAGE_SIZE,
+        ADMIN_NDJSON_MAX_PAGE_SIZE if ndjson else ADMIN_MAX_PAGE_SIZE
+    )
+    query = URLMap.get_page_query(
+        cursor=parse_positive_int(request.args, 'cursor'),
+        created_from=parse_datetime(request.args, 'created_from'),
+        created_to=parse_datetime(request.args, 'created_to'),
+        prefix=parse_short_prefix(request.args, 'prefix')
+    ).limit(limit)
+    if ndjson:
+        return stream_ndjson(query)
+
+    items = query.all()
+    next_cursor = items[-1].id if len(items) == limit else None
+    return jsonify({
+        'items': [urlmap.to_dict() for urlmap in items],
+        'next_cursor': next_cursor
+    })
+
+
+@app.route('/api/admin/changes/')
+@admin_required
+def list_changes() -> Response:
+    """
+    Возвращает записи URLMap, созданные после курсора `since`.
+
+    Параметры запроса: `since` (`id` последней применённой записи, по
+    умолчанию 0), `limit` и `format=ndjson`. В формате JSON ответ
+    содержит `items`, `cursor` (курсор для следующего запроса) и
+    `has_more`; в формате NDJSON курсором служит `id` последней строки.
+
+    Returns:
+        Response: Ответ в формате JSON или NDJSON.
+
+    Raises:
+        InvalidAPIUsage: При некорректных параметрах запроса.
+    """
+    ndjson = wants_ndjson()
+    since = parse_non_negative_int(request.args, 'since', 0)
+    limit = parse_positive_int(
+        request.args, 'limit', ADMIN_PAGE_SIZE,
+        ADMIN_NDJSON_MAX_PAGE_SIZE if ndjson else ADMIN_MAX_PAGE_SIZE
+    )
+    query = URLMap.get_changes_query(since).limit(limit)
+    if ndjson:
+        return stream_ndjson(query)
+
+    items = query.all()
+    return jsonify({
+        'items': [urlmap.to_dict() for urlmap in items],
+        'cursor': items[-1].id if items else since,
+        'has_more': len(items) == limit
+    })
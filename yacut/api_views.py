@@ -1,16 +1,21 @@
+import re
 from http import HTTPStatus
 
 from flask import Response, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 
-from yacut import app, db
+from yacut import app, db, limiter
+from yacut.constants import (CUSTOM_ID_REGEX, MAX_SUGGESTIONS_COUNT,
+                             SHORTENED_ID_MAX_LENGTH, SUGGESTIONS_COUNT)
 from yacut.error_handlers import InvalidAPIUsage
 from yacut.exceptions import ShortIDGenerationError
 from yacut.models import URLMap
-from yacut.validators import validate_data
+from yacut.short_index import short_index
+from yacut.validators import parse_positive_int, validate_data
 
 
 @app.route('/api/id/', methods=['POST'])
+@limiter.limit('create')
 def add_short_id() -> tuple[Response, int]:
     """
     Обрабатывает POST-запрос на создание новой короткой ссылки.
@@ -58,6 +63,7 @@ def add_short_id() -> tuple[Response, int]:
 
 
 @app.route('/api/id/<string:short_id>/')
+@limiter.limit('resolve')
 def get_original_link(short_id: str) -> tuple[Response, int]:
     """
     Возвращает оригинальную ссылку по короткому идентификатору.
@@ -77,3 +83,37 @@ def get_original_link(short_id: str) -> tuple[Response, int]:
             'Указанный id не найден', HTTPStatus.NOT_FOUND
         )
     return jsonify({'url': urlmap.original}), HTTPStatus.OK
+
+
+@app.route('/api/availability/<string:custom_id>/')
+@limiter.limit('resolve')
+def check_availability(custom_id: str) -> tuple[Response, int]:
+    """
+    Проверяет, свободна ли короткая ссылка, и предлагает альтернативы.
+
+    Ответ строится по индексу коротких ссылок в памяти, без запросов к
+    базе данных. Количество вариантов задаётся параметром `count`.
+
+    Args:
+        custom_id (str): Желаемый вариант короткой ссылки.
+
+    Returns:
+        tuple[Response, int]: Ответ Flask в формате JSON и HTTP-статус код.
+
+    Raises:
+        InvalidAPIUsage: Если имя недопустимо или `count` некорректен.
+    """
+    if (not re.fullmatch(CUSTOM_ID_REGEX, custom_id)
+            or len(custom_id) > SHORTENED_ID_MAX_LENGTH):
+        raise InvalidAPIUsage('Указано недопустимое имя для короткой ссылки')
+    count = parse_positive_int(
+        request.args, 'count', SUGGESTIONS_COUNT, MAX_SUGGESTIONS_COUNT
+    )
+    available = short_index.is_available(custom_id)
+    return jsonify({
+        'custom_id': custom_id,
+        'available': available,
+        'suggestions': [] if available else short_index.suggest(
+            custom_id, count
+        )
+    }), HTTPStatus.OK
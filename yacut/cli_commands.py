@@ -0,0 +1,177 @@
+import json
+import os
+from typing import Iterator
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+import click
+import flask_migrate
+
+from yacut import app, db
+from yacut.constants import (LINK_CHECK_BATCH_SIZE, LINK_CHECK_TIMEOUT,
+                             LINK_CHECK_WORKERS)
+from yacut.index_audit import (ShapeReport, audit_queries,
+                               keep_index_operations, missing_model_indexes,
+                               suggest_index)
+from yacut.link_checker import LinkChecker
+from yacut.models import URLMap
+from yacut.rate_limit import API_KEY_HEADER
+from yacut.snapshot import Snapshot, merge_snapshot, write_snapshot
+
+SNAPSHOT_EXPORT_BATCH_SIZE = 10_000
+CHANGES_BATCH_SIZE = 1_000
+CHANGES_API_TIMEOUT = 30
+
+
+@app.cli.command('check_links')
+@click.option('--workers', default=LINK_CHECK_WORKERS, show_default=True,
+              help='Сколько хостов проверять одновременно.')
+@click.option('--batch-size', default=LINK_CHECK_BATCH_SIZE,
+              show_default=True, help='Размер пачки ссылок.')
+@click.option('--timeout', default=LINK_CHECK_TIMEOUT, show_default=True,
+              help='Таймаут запроса в секундах.')
+def check_links_command(workers, batch_size, timeout):
+    """Проверяет доступность оригинальных ссылок, которым подошёл срок."""
+    stats = LinkChecker(workers, batch_size, timeout).run()
+    click.echo(
+        f'Проверено ссылок: {stats["checked"]}, '
+        f'недоступно: {stats["dead"]}'
+    )
+
+
+@app.cli.command('export_snapshot')
+@click.argument('path')
+def export_snapshot_command(path):
+    """Выгружает таблицу URLMap в файл снимка для узлов только на чтение."""
+    # Отметка «высокой воды» берётся с запасом — перед первой
+    # неустоявшейся записью (см. URLMap.first_unsettled_id): записи новее
+    # неё выгружаются, но sync_snapshot получит их повторно, а вместе с
+    # ними и записи, зафиксированные позже выгрузки
+    first_unsettled = db.session.scalar(db.select(URLMap.first_unsettled_id()))
+    if first_unsettled is not None:
+        high_water_id = first_unsettled - 1
+    else:
+        high_water_id = db.session.scalar(db.select(db.func.max(URLMap.id)))
+    high_water_id = high_water_id or 0
+    rows = db.session.execute(
+        db.select(URLMap.short, URLMap.original)
+        .order_by(URLMap.short_binary())
+        .execution_options(yield_per=SNAPSHOT_EXPORT_BATCH_SIZE)
+    )
+    count = write_snapshot(path, rows, high_water_id)
+    click.echo(f'Выгружено записей: {count}')
+
+
+def iter_changes_from_db(since: int, batch_size: int) -> Iterator[dict]:
+    while True:
+        batch = URLMap.get_changes_query(since).limit(batch_size).all()
+        if not batch:
+            return
+        for urlmap in batch:
+            yield urlmap.to_dict()
+        since = batch[-1].id
+
+
+def iter_changes_from_api(source: str, api_key: str, since: int,
+                          batch_size: int) -> Iterator[dict]:
+    while True:
+        query = urlencode({'since': since, 'limit': batch_size})
+        api_request = Request(
+            f'{source.rstrip("/")}/api/admin/changes/?{query}',
+            headers={API_KEY_HEADER: api_key or ''}
+        )
+        with urlopen(api_request, timeout=CHANGES_API_TIMEOUT) as response:
+            page = json.load(response)
+        yield from page['items']
+        since = page['cursor']
+        if not page['has_more']:
+            return
+
+
+@app.cli.command('changes')
+@click.option('--since', default=0, show_default=True,
+              help='id последней уже полученной записи.')
+@click.option('--batch-size', default=CHANGES_BATCH_SIZE, show_default=True)
+def changes_command(since, batch_size):
+    """Выводит в NDJSON записи, созданные после курсора --since."""
+    cursor = since
+    for item in iter_changes_from_db(since, batch_size):
+        click.echo(json.dumps(item, ensure_ascii=False))
+        cursor = item['id']
+    click.echo(f'Курсор: {cursor}', err=True)
+
+
+@app.cli.command('sync_snapshot')
+@click.argument('path')
+@click.option('--source', help='Адрес основного сервиса YaCut; если не '
+              'задан, изменения читаются из настроенной базы данных.')
+@click.option('--api-key', envvar='ADMIN_API_KEY',
+              help='Ключ административного API основного сервиса.')
+@click.option('--batch-size', default=CHANGES_BATCH_SIZE, show_default=True)
+def sync_snapshot_command(path, source, api_key, batch_size):
+    """Дополняет снимок записями, созданными после его выгрузки."""
+    snapshot = Snapshot(path)
+    since = snapshot.high_water_id
+    snapshot.close()
+    if source:
+        changes = iter_changes_from_api(source, api_key, since, batch_size)
+    else:
+        changes = iter_changes_from_db(since, batch_size)
+    delta = {}
+    for item in changes:
+        delta[item['short']] = item['original']
+        since = item['id']
+    if not delta:
+        click.echo('Новых записей нет')
+        return
+    count = merge_snapshot(path, delta.items(), since)
+    click.echo(f'Добавлено записей: {len(delta)}, всего в снимке: {count}')
+
+
+def echo_shape_report(report: ShapeReport) -> bool:
+    """Выводит план запроса; возвращает True, если в нём есть проблема."""
+    if not report.analysed:
+        status = 'ПЛАН НЕ РАЗОБРАН'
+    else:
+        status = 'ПОЛНЫЙ ПРОСМОТР' if report.full_scans else 'ok'
+    click.echo(f'[{status}] {report.shape.name}')
+    for line in report.plan:
+        marker = '!' if line.strip() in report.warnings else ' '
+        click.echo(f'  {marker} {line}')
+    for table_column in report.index_columns:
+        click.echo(f'    Предлагается: {suggest_index(table_column)}')
+    return not report.analysed or bool(report.full_scans)
+
+
+@app.cli.command('audit_indexes')
+@click.option('--generate', is_flag=True,
+              help='Создать миграцию Alembic только с индексами, '
+              'объявленными в моделях, но отсутствующими в базе данных.')
+def audit_indexes_command(generate):
+    """
+    Проверяет планы типовых запросов и наличие нужных индексов.
+
+    Планы разбираются для SQLite и PostgreSQL; на других СУБД они
+    выводятся с пометкой «план не разобран», и команда завершается с
+    ошибкой, чтобы отсутствие проверки не выглядело как успех.
+    """
+    with db.engine.connect() as connection:
+        reports = audit_queries(connection)
+    problems = sum(echo_shape_report(report) for report in reports)
+
+    missing = missing_model_indexes(db.engine)
+    for index in missing:
+        click.echo(f'Индекс из модели отсутствует в базе данных: {index}')
+    if missing and generate:
+        if not os.path.isdir(app.extensions['migrate'].directory):
+            raise click.ClickException(
+                'Каталог миграций не найден, выполните `flask db init`.'
+            )
+        configure_args = app.extensions['migrate'].configure_args
+        configure_args['process_revision_directives'] = keep_index_operations
+        try:
+            flask_migrate.migrate(message='add missing indexes')
+        finally:
+            del configure_args['process_revision_directives']
+    if problems or missing:
+        raise SystemExit(1)
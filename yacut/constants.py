@@ -1,4 +1,7 @@
+import string
+
 # Параметры генерации коротких идентификаторов
+SHORT_ID_ALPHABET = string.ascii_letters + string.digits
 SHORTENED_ID_GEN_LENGTH = 6
 MAX_GEN_ATTEMPTS = 100_000
 
@@ -6,3 +9,48 @@ MAX_GEN_ATTEMPTS = 100_000
 SHORTENED_ID_MAX_LENGTH = 16
 URL_MAX_LENGTH = 256
 CUSTOM_ID_REGEX = r'^[a-zA-Z0-9]+$'
+ASCII_DIGITS_REGEX = r'[0-9]+'
+
+# Сколько ссылок может быть в таблице, чтобы индекс занятых имён
+# строился в памяти; при большем числе имена проверяются запросами к базе
+SHORT_INDEX_MAX_SIZE = 1_000_000
+
+# Сколько префиксов коротких ссылок (по одному на хост) держать в кеше
+SHORT_URL_PREFIX_CACHE_SIZE = 64
+
+# Сопоставления, при которых строки сравниваются побайтово
+BINARY_COLLATIONS = {
+    'postgresql': 'C',
+    'mysql': 'utf8mb4_bin',
+    'mariadb': 'utf8mb4_bin',
+    'sqlite': 'BINARY',
+}
+
+# Параметры постраничного просмотра в административном API
+ADMIN_PAGE_SIZE = 100
+ADMIN_MAX_PAGE_SIZE = 1_000
+ADMIN_NDJSON_MAX_PAGE_SIZE = 100_000
+ADMIN_STREAM_BATCH_SIZE = 1_000
+# Верхняя граница целочисленных параметров запроса (BIGINT в базе)
+QUERY_INT_MAX = 2 ** 63 - 1
+
+# Количество вариантов, предлагаемых вместо занятой короткой ссылки
+SUGGESTIONS_COUNT = 5
+MAX_SUGGESTIONS_COUNT = 50
+
+# Параметры фоновой проверки доступности оригинальных ссылок
+LINK_CHECK_WORKERS = 8
+LINK_CHECK_BATCH_SIZE = 500
+LINK_CHECK_TIMEOUT = 5
+LINK_CHECK_INTERVAL = 24 * 60 * 60
+LINK_CHECK_BACKOFF_BASE = 15 * 60
+LINK_CHECK_BACKOFF_MAX = 7 * 24 * 60 * 60
+LINK_CHECK_ERROR_MAX_LENGTH = 256
+
+# Разбиение пространства коротких ID между процессами: префикс раздела
+# и размер блока смещений, резервируемого за один запрос к базе данных
+SHORT_ID_PARTITION_PREFIX_LENGTH = 2
+SHORT_ID_PARTITION_BLOCK_SIZE = 1_000
+SHORT_ID_PARTITION_LEASE = 10 * 60
+SHORT_ID_PARTITION_HEARTBEAT = 60
+SHORT_ID_PARTITION_OWNER_MAX_LENGTH = 128
@@ -1,8 +1,10 @@
+import math
 from http import HTTPStatus
 
-from flask import jsonify, render_template
+from flask import jsonify, render_template, request
 
 from yacut import app, db
+from yacut.exceptions import RateLimitExceeded
 
 
 class InvalidAPIUsage(Exception):
@@ -43,6 +45,17 @@ def handle_invalid_usage(error):
     return jsonify(error.to_dict()), error.status_code
 
 
+@app.errorhandler(RateLimitExceeded)
+def too_many_requests(error):
+    if request.path.startswith('/api/'):
+        response = jsonify(message='Слишком много запросов')
+    else:
+        response = app.make_response(render_template('429.html'))
+    response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+    response.headers['Retry-After'] = str(max(math.ceil(error.retry_after), 1))
+    return response
+
+
 @app.errorhandler(404)
 def page_not_found(error):
     return render_template('404.html'), HTTPStatus.NOT_FOUND
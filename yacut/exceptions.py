@@ -1,3 +1,20 @@
+from http import HTTPStatus
+
+
 class ShortIDGenerationError(RuntimeError):
     """Исключение, возникающее при невозможности сгенерировать
     уникальный short_id."""
+
+
+class RateLimitExceeded(Exception):
+    """Исключение, возникающее при исчерпании бюджета запросов клиента.
+
+    Attributes:
+        retry_after (float): Через сколько секунд можно повторить запрос.
+    """
+
+    code = HTTPStatus.TOO_MANY_REQUESTS
+
+    def __init__(self, retry_after: float):
+        super().__init__()
+        self.retry_after = retry_after
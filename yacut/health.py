@@ -0,0 +1,198 @@
+import threading
+import time
+from http import HTTPStatus
+from typing import Optional
+
+from flask import Flask, Response, current_app, jsonify
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+
+from yacut import access_logger, app, db, resolution_cache
+from yacut.models import URLMap
+from yacut.resolution_cache import PrecompiledRedirect
+from yacut.snapshot import SnapshotFormatError, get_snapshot_resolver
+
+DB_NOT_CHECKED = 'Проверка базы данных ещё не выполнена'
+
+
+def pool_status() -> dict:
+    """Загрузка пула соединений; `saturation` > 1 — работа сверх `size`."""
+    pool = db.engine.pool
+    if not isinstance(pool, QueuePool):
+        return {'class': type(pool).__name__}
+    size = pool.size()
+    checked_out = pool.checkedout()
+    return {
+        'class': type(pool).__name__,
+        'size': size,
+        'checked_out': checked_out,
+        'overflow': max(pool.overflow(), 0),
+        'saturation': round(checked_out / size, 2) if size else None,
+    }
+
+
+def snapshot_status(config) -> dict:
+    """Состояние снимка URLMap на узле, работающем без базы данных."""
+    try:
+        snapshot = get_snapshot_resolver(config).snapshot
+    except (OSError, SnapshotFormatError) as error:
+        return {'ok': False, 'error': type(error).__name__}
+    return {
+        'ok': True,
+        'records': len(snapshot),
+        'high_water_id': snapshot.high_water_id,
+    }
+
+
+class Readiness:
+    """
+    Состояние готовности узла принимать трафик.
+
+    Проверка соединения с базой данных выполняется не чаще раза в
+    `HEALTH_DB_PROBE_INTERVAL` секунд и только одним запросом: пока он
+    ждёт базу, остальные сразу получают результат предыдущей проверки.
+    Если кеш переходов используется и задан `RESOLUTION_CACHE_WARMUP`,
+    узел готов только после того, как фоновый поток загрузит в кеш
+    столько последних созданных ссылок.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._db_checked_at: Optional[float] = None
+        self._db_error: Optional[str] = DB_NOT_CHECKED
+        self._db_refreshing = False
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self.warm = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._db_checked_at = None
+            self._db_error = DB_NOT_CHECKED
+            self.warm = False
+
+    def database_error(self, interval: float) -> Optional[str]:
+        """Возвращает ошибку последней проверки базы или None."""
+        with self._lock:
+            now = time.monotonic()
+            if self._db_refreshing or (
+                self._db_checked_at is not None
+                and now - self._db_checked_at < interval
+            ):
+                return self._db_error
+            self._db_refreshing = True
+        error = self._db_error
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            error = None
+        except SQLAlchemyError as e:
+            error = type(e).__name__
+        finally:
+            with self._lock:
+                self._db_error = error
+                self._db_checked_at = time.monotonic()
+                self._db_refreshing = False
+        return error
+
+    def warm_up(self, app: Flask) -> int:
+        """
+        Загружает в кеш переходов последние созданные ссылки.
+
+        Returns:
+            int: Число загруженных записей.
+        """
+        with app.app_context():
+            rows = db.session.execute(
+                select(URLMap.short, URLMap.original)
+                .order_by(URLMap.id.desc())
+                .limit(app.config['RESOLUTION_CACHE_WARMUP'])
+            ).all()
+            for short, original in rows:
+                resolution_cache.put(
+                    short, PrecompiledRedirect.build(original)
+                )
+        self.warm = True
+        return len(rows)
+
+    def _run_warm_up(self, app: Flask) -> None:
+        try:
+            self.warm_up(app)
+        except SQLAlchemyError:
+            app.logger.exception('Не удалось прогреть кеш переходов')
+        finally:
+            self._warm_up_thread = None
+
+    def is_warm(self, app: Flask) -> bool:
+        """
+        Сообщает, прогрет ли кеш; при необходимости начинает прогрев.
+
+        Узел со снимком URLMap (`URLMAP_SNAPSHOT_PATH`) ищет ссылки в
+        снимке, поэтому кеш из базы данных не прогревается.
+        """
+        config = app.config
+        if (self.warm or not config['RESOLUTION_CACHE_WARMUP']
+                or config['URLMAP_SNAPSHOT_PATH'] or not (
+                    config['REDIRECT_PRECOMPILED']
+                    or config['REDIRECT_TIER_ENABLED'])):
+            return True
+        with self._lock:
+            if self._warm_up_thread is None:
+                self._warm_up_thread = threading.Thread(
+                    target=self._run_warm_up, args=(app,), daemon=True
+                )
+                self._warm_up_thread.start()
+        return False
+
+
+readiness = Readiness()
+
+
+# Служебные маршруты начинаются с `/-/`: дефис не допускается в коротких
+# ссылках, поэтому они не перекрывают пользовательские ID вроде `healthz`.
+@app.route('/-/healthz')
+def healthz() -> Response:
+    """Проверка живости процесса: без обращения к базе и кешам."""
+    return jsonify(status='ok')
+
+
+@app.route('/-/readyz')
+def readyz() -> tuple[Response, int]:
+    """
+    Проверка готовности узла принимать трафик.
+
+    На узле со снимком URLMap база данных не нужна для переходов, поэтому
+    вместо неё проверяется, что снимок открывается.
+
+    Returns:
+        tuple[Response, int]: Состояние базы данных (или снимка), пула
+        соединений, кеша переходов и счётчики журнала переходов
+        (записано, отброшено при переполнении очереди, не попало в
+        выборку); 200, если узел готов, иначе 503.
+    """
+    flask_app = current_app._get_current_object()
+    config = flask_app.config
+    status = {}
+    if config['URLMAP_SNAPSHOT_PATH']:
+        status['snapshot'] = snapshot_status(config)
+        ready = status['snapshot']['ok']
+    else:
+        db_error = readiness.database_error(
+            config['HEALTH_DB_PROBE_INTERVAL']
+        )
+        status['database'] = {'ok': db_error is None, 'error': db_error}
+        status['pool'] = pool_status()
+        ready = db_error is None
+    warm = readiness.is_warm(flask_app)
+    ready = ready and warm
+    return jsonify(
+        status='ready' if ready else 'not_ready',
+        cache={
+            'entries': len(resolution_cache),
+            'warm': warm,
+            'hits': resolution_cache.hits,
+            'misses': resolution_cache.misses,
+        },
+        access_log=access_logger.stats(),
+        **status,
+    ), HTTPStatus.OK if ready else HTTPStatus.SERVICE_UNAVAILABLE
@@ -0,0 +1,267 @@
+import re
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from alembic.operations import ops
+from sqlalchemy import Column, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import visitors
+
+from yacut import db
+from yacut.link_checker import LinkChecker
+from yacut.models import URLMap, partitioned_generator
+
+SAMPLE_TIME = datetime(2024, 1, 1)
+SAMPLE_SHORT = 'abc123'
+SAMPLE_PREFIX = 'ab'
+SAMPLE_OWNER = 'host:1'
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+SQLITE_TEMP_SORT = 'USE TEMP B-TREE'
+POSTGRESQL_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+# СУБД, планы которых умеет разбирать analyze_plan
+ANALYSED_DIALECTS = ('sqlite', 'postgresql')
+
+
+class QueryShape(NamedTuple):
+    """
+    Типовой запрос приложения для проверки плана выполнения.
+
+    Attributes:
+        name (str): Название запроса.
+        build (Callable): Функция, строящая запрос (Query или
+            выражение SQLAlchemy Core) теми же методами, что использует
+            приложение.
+    """
+
+    name: str
+    build: Callable
+
+
+QUERY_SHAPES = (
+    QueryShape(
+        'get_by_short (redirect and creation existence check)',
+        lambda: URLMap.query.filter(
+            URLMap.short_filter(SAMPLE_SHORT)
+        ).limit(1)
+    ),
+    QueryShape(
+        'creation: stale partition lookup (SHORT_ID_PARTITIONED)',
+        lambda: partitioned_generator.stale_partition_query(SAMPLE_TIME)
+    ),
+    QueryShape(
+        'creation: partition block reservation (SHORT_ID_PARTITIONED)',
+        lambda: partitioned_generator.reserve_block_statement(
+            SAMPLE_PREFIX, SAMPLE_OWNER
+        )
+    ),
+    QueryShape(
+        'admin listing',
+        lambda: URLMap.get_page_query(cursor=1000).limit(100)
+    ),
+    QueryShape(
+        'admin listing by time range',
+        lambda: URLMap.get_page_query(
+            created_from=SAMPLE_TIME, created_to=SAMPLE_TIME
+        ).limit(100)
+    ),
+    QueryShape(
+        'admin listing by prefix',
+        lambda: URLMap.get_page_query(prefix='ab').limit(100)
+    ),
+    QueryShape(
+        'change feed',
+        lambda: URLMap.get_changes_query(1000).limit(1000)
+    ),
+    QueryShape(
+        'link checker due batch',
+        lambda: LinkChecker.due_query(0, SAMPLE_TIME).limit(500)
+    ),
+)
+
+
+class ShapeReport(NamedTuple):
+    shape: QueryShape
+    plan: list[str]
+    full_scans: list[str]
+    warnings: list[str]
+    index_columns: list[str]
+    analysed: bool
+
+
+def _statement(query):
+    """Возвращает выражение SQLAlchemy для Query или его самого."""
+    return getattr(query, 'statement', query)
+
+
+def _driver_params(compiled) -> object:
+    if compiled.positional:
+        return tuple(compiled.params[name] for name in compiled.positiontup)
+    return compiled.params
+
+
+def explain(connection: Connection, query) -> list[str]:
+    """
+    Возвращает план выполнения запроса в виде строк.
+
+    Для SQLite используется `EXPLAIN QUERY PLAN`, для остальных СУБД —
+    `EXPLAIN` (разбор плана поддерживается для PostgreSQL).
+    """
+    dialect = connection.dialect
+    compiled = _statement(query).compile(dialect=dialect)
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    )
+    rows = connection.exec_driver_sql(
+        prefix + str(compiled), _driver_params(compiled)
+    ).fetchall()
+    if dialect.name == 'sqlite':
+        return [row[-1] for row in rows]
+    return [' | '.join(str(value) for value in row) for row in rows]
+
+
+def analyze_plan(dialect_name: str,
+                 plan: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Находит в плане полные просмотры таблиц и сортировки без индекса.
+
+    Разбираются только планы СУБД из `ANALYSED_DIALECTS`; для остальных
+    `audit_queries` помечает отчёт как неразобранный.
+
+    Returns:
+        tuple[list[str], list[str]]: Таблицы, просматриваемые целиком, и
+        предупреждения.
+    """
+    full_scans, warnings = [], []
+    for line in plan:
+        if dialect_name == 'sqlite':
+            match = SQLITE_FULL_SCAN.match(line.strip())
+            if SQLITE_TEMP_SORT in line:
+                warnings.append(line.strip())
+        else:
+            match = POSTGRESQL_FULL_SCAN.search(line)
+        if match:
+            full_scans.append(match.group(1))
+    return full_scans, warnings
+
+
+def filter_columns(query, tables: list[str]) -> list[str]:
+    """
+    Возвращает столбцы условия запроса, по которым стоит создать индекс.
+
+    Берутся столбцы из WHERE, принадлежащие таблицам `tables`, кроме
+    первичного ключа: индекс по нему уже есть, и полный просмотр
+    означает, что запросу не хватает индекса по другим столбцам.
+
+    Returns:
+        list[str]: Столбцы вида `таблица.столбец` в порядке появления.
+    """
+    whereclause = _statement(query).whereclause
+    if whereclause is None:
+        return []
+    columns = []
+    for element in visitors.iterate(whereclause):
+        if not isinstance(element, Column) or element.primary_key:
+            continue
+        table_column = f'{element.table.name}.{element.name}'
+        if element.table.name in tables and table_column not in columns:
+            columns.append(table_column)
+    return columns
+
+
+def audit_queries(connection: Connection) -> list[ShapeReport]:
+    """Строит и анализирует планы всех типовых запросов приложения."""
+    dialect_name = connection.dialect.name
+    if dialect_name == 'postgresql':
+        # На маленьких таблицах PostgreSQL выбирает Seq Scan, даже если
+        # подходящий индекс есть. Запрет действует до конца транзакции
+        # проверки, и полный просмотр в плане остаётся только там, где
+        # индекса нет.
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    reports = []
+    for shape in QUERY_SHAPES:
+        query = shape.build()
+        plan = explain(connection, query)
+        analysed = dialect_name in ANALYSED_DIALECTS
+        full_scans, warnings = (
+            analyze_plan(dialect_name, plan) if analysed else ([], [])
+        )
+        reports.append(ShapeReport(
+            shape, plan, full_scans, warnings,
+            filter_columns(query, full_scans) if full_scans else [],
+            analysed
+        ))
+    return reports
+
+
+def missing_model_indexes(engine: Engine) -> list[str]:
+    """
+    Возвращает индексы, объявленные в моделях, но отсутствующие в базе.
+
+    Такие индексы появляются, если модель изменили, а миграцию не
+    создали или не применили.
+    """
+    inspector = inspect(engine)
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            missing.append(f'{table.name} (таблица отсутствует)')
+            continue
+        existing = {
+            tuple(index['column_names'])
+            for index in inspector.get_indexes(table.name)
+        } | {
+            tuple(constraint['column_names'])
+            for constraint in inspector.get_unique_constraints(table.name)
+        }
+        expected = [
+            tuple(column.name for column in index.columns)
+            for index in table.indexes
+        ] + [
+            (column.name,) for column in table.columns if column.unique
+        ]
+        missing.extend(
+            f'{table.name}({", ".join(columns)})'
+            for columns in expected if columns not in existing
+        )
+    return missing
+
+
+def _keep_operations(operations: list, kinds: tuple) -> list:
+    kept = []
+    for operation in operations:
+        if isinstance(operation, ops.ModifyTableOps):
+            operation.ops = _keep_operations(operation.ops, kinds)
+            if operation.ops:
+                kept.append(operation)
+        elif isinstance(operation, kinds) and (
+            not isinstance(operation, ops.DropConstraintOp)
+            or operation.constraint_type == 'unique'
+        ):
+            kept.append(operation)
+    return kept
+
+
+def keep_index_operations(context, revision, directives) -> None:
+    """
+    Оставляет в автоматически созданной миграции только новые индексы.
+
+    Передаётся в Alembic как `process_revision_directives`: остальные
+    расхождения моделей и базы данных (столбцы, таблицы, лишние
+    индексы) в миграцию не попадают. Если новых индексов нет, миграция
+    не создаётся.
+    """
+    script = directives[0]
+    script.upgrade_ops.ops = _keep_operations(
+        script.upgrade_ops.ops,
+        (ops.CreateIndexOp, ops.CreateUniqueConstraintOp)
+    )
+    script.downgrade_ops.ops = _keep_operations(
+        script.downgrade_ops.ops, (ops.DropIndexOp, ops.DropConstraintOp)
+    )
+    if script.upgrade_ops.is_empty():
+        directives[:] = []
+
+
+def suggest_index(table_column: str) -> str:
+    table, column = table_column.split('.')
+    return f'CREATE INDEX ix_{table}_{column} ON {table} ({column});'
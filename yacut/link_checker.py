@@ -0,0 +1,280 @@
+import ipaddress
+import socket
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from http import HTTPStatus
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from flask import current_app
+
+from yacut import db
+from yacut.constants import (LINK_CHECK_BACKOFF_BASE, LINK_CHECK_BACKOFF_MAX,
+                             LINK_CHECK_BATCH_SIZE,
+                             LINK_CHECK_ERROR_MAX_LENGTH, LINK_CHECK_INTERVAL,
+                             LINK_CHECK_TIMEOUT, LINK_CHECK_WORKERS)
+from yacut.models import LinkCheck, URLMap
+
+USER_AGENT = 'YaCut-LinkChecker/1.0'
+CONNECTION_CLASSES = {'http': HTTPConnection, 'https': HTTPSConnection}
+METHOD_NOT_SUPPORTED = (
+    HTTPStatus.METHOD_NOT_ALLOWED, HTTPStatus.NOT_IMPLEMENTED
+)
+UNSUPPORTED_ADDRESS = 'Неподдерживаемый адрес'
+
+
+class UnsupportedAddress(Exception):
+    """У хоста нет адресов, к которым проверке разрешено подключаться."""
+
+
+class CheckResult(NamedTuple):
+    urlmap_id: int
+    status_code: Optional[int]
+    error: Optional[str]
+
+    @property
+    def is_alive(self) -> bool:
+        return self.error is None and self.status_code < HTTPStatus.BAD_REQUEST
+
+
+def _request_status(connection: HTTPConnection, target: str) -> int:
+    """
+    Запрашивает ресурс методом HEAD (или GET, если HEAD не поддержан).
+
+    После HEAD соединение переиспользуется для следующего запроса. Тело
+    ответа на GET не читается: соединение закрывается, чтобы не скачивать
+    в память ресурс произвольного размера, и следующий запрос откроет
+    новое.
+    """
+    headers = {'User-Agent': USER_AGENT}
+    connection.request('HEAD', target, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    if response.status not in METHOD_NOT_SUPPORTED:
+        return response.status
+    connection.request('GET', target, headers=headers)
+    response = connection.getresponse()
+    response.close()
+    connection.close()
+    return response.status
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Проверяет, что IP-адрес маршрутизируется в интернете.
+
+    Loopback, link-local (в том числе 169.254.169.254 — метаданные
+    облака), частные сети RFC 1918, зарезервированные и multicast-адреса
+    считаются непубличными. IPv4, отображённый в IPv6, проверяется как
+    IPv4.
+    """
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def resolve_address(host: str, port: int, allow_private: bool) -> str:
+    """
+    Разрешает имя хоста и выбирает адрес, к которому можно подключаться.
+
+    Raises:
+        UnsupportedAddress: Если все адреса хоста непубличные, а
+            `allow_private` не задан.
+        OSError: Если имя не удалось разрешить.
+    """
+    for *_, sockaddr in socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    ):
+        if allow_private or is_public_address(sockaddr[0]):
+            return sockaddr[0]
+    raise UnsupportedAddress(host)
+
+
+def _pinned_connection(address: str, host_port: tuple, *args, **kwargs):
+    return socket.create_connection((address, host_port[1]), *args, **kwargs)
+
+
+def _host_address(connection_class: type, netloc: str,
+                  allow_private: bool) -> tuple[Optional[str], Optional[str]]:
+    """Возвращает адрес для подключения к хосту или текст ошибки."""
+    try:
+        # Конструктор соединения только разбирает хост и порт
+        probe = connection_class(netloc)
+        return resolve_address(probe.host, probe.port, allow_private), None
+    except UnsupportedAddress:
+        return None, UNSUPPORTED_ADDRESS
+    except (OSError, HTTPException, ValueError) as e:
+        return None, f'{type(e).__name__}: {e}'[:LINK_CHECK_ERROR_MAX_LENGTH]
+
+
+def check_host(scheme: str, netloc: str, targets: list[tuple[int, str]],
+               timeout: float = LINK_CHECK_TIMEOUT,
+               allow_private: bool = False) -> list[CheckResult]:
+    """
+    Проверяет все ссылки одного хоста через общее keep-alive соединение.
+
+    Имя хоста разрешается один раз. Если у него нет публичных адресов
+    (loopback, частные сети, метаданные облака), ссылки не запрашиваются
+    и получают ошибку `Неподдерживаемый адрес`: иначе проверка позволяла
+    бы обращаться из внутренней сети сервера к любому адресу. Соединения
+    открываются к проверенному адресу, а не к повторно разрешённому
+    имени, поэтому подмена DNS-ответа между проверкой и запросом ничего
+    не даёт; заголовок Host и SNI по-прежнему содержат имя хоста.
+
+    При сетевой ошибке соединение пересоздаётся, и запрос повторяется
+    один раз: сервер мог закрыть простаивающее соединение. Некорректный
+    адрес (например, слишком длинная метка хоста, которую не принимает
+    кодек idna) считается недоступной ссылкой и не прерывает проверку.
+
+    Args:
+        scheme (str): Схема (http или https).
+        netloc (str): Хост и, при необходимости, порт.
+        targets (list[tuple[int, str]]): Пары (id записи URLMap, путь
+            с query-строкой).
+        timeout (float): Таймаут соединения и чтения в секундах.
+        allow_private (bool): Разрешить непубличные адреса.
+
+    Returns:
+        list[CheckResult]: Результаты проверки в порядке `targets`.
+    """
+    connection_class = CONNECTION_CLASSES[scheme]
+    address, error = _host_address(connection_class, netloc, allow_private)
+    if address is None:
+        return [
+            CheckResult(urlmap_id, None, error) for urlmap_id, _ in targets
+        ]
+    connection = None
+    results = []
+    for urlmap_id, target in targets:
+        for _ in range(2):
+            try:
+                if connection is None:
+                    connection = connection_class(netloc, timeout=timeout)
+                    connection._create_connection = partial(
+                        _pinned_connection, address
+                    )
+                status_code, error = _request_status(connection, target), None
+                break
+            except (OSError, HTTPException, ValueError) as e:
+                if connection is not None:
+                    connection.close()
+                connection = None
+                status_code = None
+                error = f'{type(e).__name__}: {e}'
+                error = error[:LINK_CHECK_ERROR_MAX_LENGTH]
+                if isinstance(e, ValueError):
+                    break
+        results.append(CheckResult(urlmap_id, status_code, error))
+    if connection is not None:
+        connection.close()
+    return results
+
+
+class LinkChecker:
+    """
+    Пул потоков для фоновой проверки доступности оригинальных ссылок.
+
+    Ссылки, которым подошёл срок проверки, выбираются из базы пачками.
+    Внутри пачки они группируются по хосту: каждый хост проверяется одним
+    потоком через одно соединение, а одновременно обрабатывается не
+    больше `workers` хостов. Результат сохраняется в `LinkCheck`;
+    недоступные ссылки перепроверяются с экспоненциально растущим
+    интервалом. Хосты с непубличными адресами не проверяются, если не
+    включён `LINK_CHECK_ALLOW_PRIVATE`.
+    """
+
+    def __init__(self, workers: int = LINK_CHECK_WORKERS,
+                 batch_size: int = LINK_CHECK_BATCH_SIZE,
+                 timeout: float = LINK_CHECK_TIMEOUT,
+                 allow_private: Optional[bool] = None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.allow_private = allow_private
+
+    @staticmethod
+    def next_check_delay(failures: int) -> timedelta:
+        if not failures:
+            return timedelta(seconds=LINK_CHECK_INTERVAL)
+        return timedelta(seconds=min(
+            LINK_CHECK_BACKOFF_BASE * 2 ** (failures - 1),
+            LINK_CHECK_BACKOFF_MAX
+        ))
+
+    @staticmethod
+    def due_query(last_id: int, now: datetime):
+        """Возвращает запрос ссылок, которым подошёл срок проверки."""
+        return URLMap.query.outerjoin(LinkCheck).filter(
+            URLMap.id > last_id,
+            db.or_(LinkCheck.id.is_(None), LinkCheck.next_check_at <= now)
+        ).order_by(URLMap.id)
+
+    def _check_batch(self, pool: ThreadPoolExecutor,
+                     batch: list[URLMap]) -> list[CheckResult]:
+        by_host = defaultdict(list)
+        results = []
+        for urlmap in batch:
+            parts = urlsplit(urlmap.original)
+            if parts.scheme not in CONNECTION_CLASSES or not parts.netloc:
+                results.append(CheckResult(
+                    urlmap.id, None, UNSUPPORTED_ADDRESS
+                ))
+                continue
+            target = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+            by_host[parts.scheme, parts.netloc].append((urlmap.id, target))
+        allow_private = self.allow_private
+        if allow_private is None:
+            allow_private = current_app.config['LINK_CHECK_ALLOW_PRIVATE']
+        futures = [
+            pool.submit(
+                check_host, scheme, netloc, targets, self.timeout,
+                allow_private
+            )
+            for (scheme, netloc), targets in by_host.items()
+        ]
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _save(self, batch: list[URLMap], results: list[CheckResult],
+              now: datetime) -> None:
+        urlmaps = {urlmap.id: urlmap for urlmap in batch}
+        for result in results:
+            urlmap = urlmaps[result.urlmap_id]
+            check = urlmap.link_check or LinkCheck(urlmap=urlmap, failures=0)
+            check.status_code = result.status_code
+            check.error = result.error
+            check.is_alive = result.is_alive
+            check.failures = 0 if result.is_alive else check.failures + 1
+            check.checked_at = now
+            check.next_check_at = now + self.next_check_delay(check.failures)
+            db.session.add(check)
+        db.session.commit()
+
+    def run(self) -> dict[str, int]:
+        """
+        Проверяет все ссылки, которым подошёл срок проверки.
+
+        Returns:
+            dict[str, int]: Количество проверенных и недоступных ссылок.
+        """
+        now = datetime.now(timezone.utc)
+        stats = {'checked': 0, 'dead': 0}
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                batch = self.due_query(last_id, now).limit(
+                    self.batch_size
+                ).all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                results = self._check_batch(pool, batch)
+                self._save(batch, results, now)
+                stats['checked'] += len(results)
+                stats['dead'] += sum(not r.is_alive for r in results)
+        return stats
@@ -1,17 +1,60 @@
 import random
 import re
-import string
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
-from flask import url_for
+from flask import current_app
+from sqlalchemy import event
 from sqlalchemy.exc import SQLAlchemyError
 
-from yacut import db
-from yacut.constants import (CUSTOM_ID_REGEX, MAX_GEN_ATTEMPTS,
+from yacut import db, resolution_cache
+from yacut.constants import (BINARY_COLLATIONS, CUSTOM_ID_REGEX,
+                             LINK_CHECK_ERROR_MAX_LENGTH, MAX_GEN_ATTEMPTS,
+                             SHORT_ID_ALPHABET,
+                             SHORT_ID_PARTITION_OWNER_MAX_LENGTH,
+                             SHORT_ID_PARTITION_PREFIX_LENGTH,
                              SHORTENED_ID_GEN_LENGTH, SHORTENED_ID_MAX_LENGTH,
                              URL_MAX_LENGTH)
 from yacut.exceptions import ShortIDGenerationError
+from yacut.partitions import PartitionedGenerator
+from yacut.short_urls import build_short_url
+
+
+class ShortIDPartition(db.Model):
+    """
+    Раздел пространства коротких ID, арендованный процессом.
+
+    Используется в режиме `SHORT_ID_PARTITIONED`: каждый процесс
+    генерирует ID только со своим префиксом, поэтому процессы на разных
+    узлах не могут выдать один и тот же ID.
+
+    Attributes:
+        id (int): Уникальный идентификатор записи.
+        prefix (str): Префикс коротких ID раздела.
+        owner (str): Процесс-владелец в виде `хост:pid`.
+        next_offset (int): Первое ещё не зарезервированное смещение.
+        registered_at (datetime): Время регистрации раздела.
+        heartbeat_at (datetime): Время последнего продления аренды.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    prefix = db.Column(
+        db.String(SHORT_ID_PARTITION_PREFIX_LENGTH),
+        unique=True,
+        nullable=False
+    )
+    owner = db.Column(
+        db.String(SHORT_ID_PARTITION_OWNER_MAX_LENGTH), nullable=False
+    )
+    next_offset = db.Column(db.Integer, nullable=False, default=0)
+    registered_at = db.Column(db.DateTime, nullable=False)
+    heartbeat_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<ShortIDPartition {self.prefix} {self.owner}>'
+
+
+partitioned_generator = PartitionedGenerator(ShortIDPartition)
 
 
 class URLMap(db.Model):
@@ -41,7 +84,8 @@ class URLMap(db.Model):
     )
     timestamp = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc),
+        index=True
     )
 
     def __repr__(self):
@@ -58,7 +102,29 @@ class URLMap(db.Model):
         Returns:
             Optional[URLMap]: Объект URLMap, если найден, иначе None.
         """
-        return URLMap.query.filter_by(short=short_id).first()
+        return URLMap.query.filter(URLMap.short_filter(short_id)).first()
+
+    @staticmethod
+    def short_filter(short_id: str):
+        """
+        Возвращает условие поиска записи по короткому идентификатору.
+
+        Используется везде, где запись ищется по short_id в обход
+        `get_by_short`.
+        """
+        return URLMap.short == short_id
+
+    @staticmethod
+    def short_binary():
+        """
+        Возвращает столбец `short` с побайтовым сопоставлением.
+
+        Используется там, где важен порядок строк: при локалезависимом
+        сопоставлении PostgreSQL или MySQL `ORDER BY short` и диапазоны
+        по `short` не совпадают с побайтовым порядком.
+        """
+        collation = BINARY_COLLATIONS.get(db.engine.dialect.name)
+        return URLMap.short.collate(collation) if collation else URLMap.short
 
     @staticmethod
     def get_unique_short_id():
@@ -72,6 +138,10 @@ class URLMap(db.Model):
         генерация повторяется до тех пор, пока не будет найдено свободное
         значение.
 
+        В режиме `SHORT_ID_PARTITIONED` ID выдаются из раздела,
+        арендованного текущим процессом, и не пересекаются с ID других
+        процессов.
+
         Returns:
             str: Строка длиной `length`, состоящая из букв и цифр.
 
@@ -79,11 +149,13 @@ class URLMap(db.Model):
             RuntimeError: Если невозможно создать уникальный short_id
                 (например, из-за истощения всех возможных комбинаций).
         """
-        selected_symbols = string.ascii_letters + string.digits
-
+        if current_app.config['SHORT_ID_PARTITIONED']:
+            return partitioned_generator.generate(
+                lambda short_id: URLMap.get_by_short(short_id) is not None
+            )
         for _ in range(MAX_GEN_ATTEMPTS):
             new_id = ''.join(random.choices(
-                selected_symbols,
+                SHORT_ID_ALPHABET,
                 k=SHORTENED_ID_GEN_LENGTH
             )
             )
@@ -142,6 +214,115 @@ class URLMap(db.Model):
 
         return urlmap
 
+    @staticmethod
+    def get_page_query(
+        cursor: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        prefix: Optional[str] = None
+    ):
+        """
+        Возвращает запрос для постраничного просмотра записей.
+
+        Используется keyset-пагинация: записи упорядочены по убыванию `id`
+        (совпадает с порядком создания), а следующая страница начинается
+        после `cursor` — `id` последней полученной записи. В отличие от
+        OFFSET, стоимость запроса не растёт с номером страницы.
+
+        Фильтр по префиксу выражен диапазоном по `short` в побайтовом
+        сопоставлении (см. `short_binary`): верхняя граница получается
+        увеличением последнего символа, что верно только для побайтового
+        порядка. На SQLite диапазон использует уникальный индекс; на
+        PostgreSQL с локалезависимым сопоставлением для этого нужен индекс
+        с COLLATE "C". Фильтр по времени использует индекс по `timestamp`.
+
+        Args:
+            cursor (int, optional): `id` последней записи предыдущей
+                страницы.
+            created_from (datetime, optional): Начало интервала создания.
+            created_to (datetime, optional): Конец интервала создания
+                (не включая).
+            prefix (str, optional): Префикс короткой ссылки.
+
+        Returns:
+            Query: Запрос без ограничения на размер страницы.
+        """
+        query = URLMap.query
+        if cursor is not None:
+            query = query.filter(URLMap.id < cursor)
+        if created_from is not None:
+            query = query.filter(URLMap.timestamp >= created_from)
+        if created_to is not None:
+            query = query.filter(URLMap.timestamp < created_to)
+        if prefix:
+            upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            short = URLMap.short_binary()
+            query = query.filter(short >= prefix, short < upper_bound)
+        return query.order_by(URLMap.id.desc())
+
+    @staticmethod
+    def settled_before() -> datetime:
+        """
+        Возвращает момент, до которого созданные записи считаются видимыми.
+
+        `id` выдаётся при вставке, а транзакции на серверной СУБД могут
+        фиксироваться в другом порядке: запись с меньшим `id` может стать
+        видимой позже записи с большим. Поэтому лента изменений отдаёт
+        только записи старше `CHANGES_SAFETY_LAG` секунд — предполагается,
+        что за это время любая транзакция создания ссылки либо
+        зафиксирована, либо откатилась. Если транзакция длится дольше
+        или часы узлов расходятся больше чем на этот интервал, запись
+        может быть пропущена.
+        """
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=current_app.config['CHANGES_SAFETY_LAG']
+        )
+
+    @staticmethod
+    def first_unsettled_id(since_id: int = 0):
+        """
+        Возвращает подзапрос наименьшего `id` среди ещё не устоявшихся
+        записей после `since_id`.
+
+        `timestamp` заполняется в приложении до вставки, поэтому при
+        параллельных вставках запись с меньшим `id` может получить более
+        позднее время. Граница ленты — первая неустоявшаяся запись, а не
+        фильтр по времени каждой записи: иначе курсор перешагнул бы через
+        неё навсегда. Записи без `timestamp` считаются неустоявшимися.
+        """
+        return db.select(db.func.min(URLMap.id)).where(
+            URLMap.id > since_id,
+            db.or_(
+                URLMap.timestamp > URLMap.settled_before(),
+                URLMap.timestamp.is_(None)
+            )
+        ).scalar_subquery()
+
+    @staticmethod
+    def get_changes_query(since_id: int = 0):
+        """
+        Возвращает запрос записей, созданных после курсора `since_id`.
+
+        Лента изменений опирается на возрастающий `id` как на отметку
+        «высокой воды»: клиент хранит `id` последней применённой записи и
+        запрашивает только более новые. Лента обрывается перед первой
+        свежей записью (см. `settled_before` и `first_unsettled_id`),
+        чтобы курсор не перескочил через запись, транзакция которой ещё
+        не зафиксирована. Записи URLMap не
+        изменяются и не удаляются, поэтому других событий в ленте нет.
+
+        Args:
+            since_id (int): `id` последней уже полученной записи.
+
+        Returns:
+            Query: Запрос, упорядоченный по возрастанию `id`.
+        """
+        first_unsettled = URLMap.first_unsettled_id(since_id)
+        return URLMap.query.filter(
+            URLMap.id > since_id,
+            db.or_(first_unsettled.is_(None), URLMap.id < first_unsettled)
+        ).order_by(URLMap.id)
+
     def to_dict(self) -> Dict[str, Any]:
         """Преобразует экземпляр модели в словарь для сериализации в JSON.
 
@@ -149,19 +330,69 @@ class URLMap(db.Model):
             Dict[str, Any]: Словарное представление модели.
         """
         return {
+            'id': self.id,
             'original': self.original,
-            'short': self.short
+            'short': self.short,
+            'timestamp': (
+                self.timestamp.isoformat() if self.timestamp else None
+            )
         }
 
     def get_short_url(self) -> str:
         """
         Возвращает полную короткую ссылку на основе текущего short_id.
 
+        Работает и вне контекста запроса, если задан `SHORT_URL_BASE`
+        или `SERVER_NAME`.
+
         Returns:
             str: Полная короткая ссылка (например, http://localhost/abc123).
         """
-        return url_for(
-            'redirect_to_original',
-            short=self.short,
-            _external=True
-        )
+        return build_short_url(self.short)
+
+
+@event.listens_for(URLMap, 'after_insert')
+def _forget_not_found(mapper, connection, target: URLMap) -> None:
+    """Снимает отметку кеша о том, что созданной ссылки не существует."""
+    resolution_cache.discard(target.short)
+
+
+class LinkCheck(db.Model):
+    """
+    Результат последней проверки доступности оригинальной ссылки.
+
+    Заполняется фоновой проверкой (`flask check_links`) и не участвует
+    в обработке переходов по коротким ссылкам.
+
+    Attributes:
+        id (int): Уникальный идентификатор записи.
+        urlmap_id (int): Проверенная запись URLMap.
+        status_code (int): HTTP-статус ответа или None при сетевой ошибке.
+        is_alive (bool): Признак того, что ссылка доступна.
+        error (str): Описание сетевой ошибки, если она произошла.
+        failures (int): Число неудачных проверок подряд.
+        checked_at (datetime): Время последней проверки.
+        next_check_at (datetime): Время, раньше которого ссылку не нужно
+            проверять повторно.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    urlmap_id = db.Column(
+        db.Integer,
+        db.ForeignKey('url_map.id'),
+        unique=True,
+        nullable=False
+    )
+    status_code = db.Column(db.Integer, nullable=True)
+    is_alive = db.Column(db.Boolean, nullable=False, default=True)
+    error = db.Column(db.String(LINK_CHECK_ERROR_MAX_LENGTH), nullable=True)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    checked_at = db.Column(db.DateTime, nullable=False)
+    next_check_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    urlmap = db.relationship(
+        URLMap, backref=db.backref('link_check', uselist=False)
+    )
+
+    def __repr__(self):
+        return f'<LinkCheck {self.urlmap_id} {self.status_code}>'
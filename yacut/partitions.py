@@ -0,0 +1,280 @@
+import atexit
+import hashlib
+import hmac
+import itertools
+import os
+import random
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from yacut import db
+from yacut.constants import (MAX_GEN_ATTEMPTS, SHORT_ID_ALPHABET,
+                             SHORT_ID_PARTITION_BLOCK_SIZE,
+                             SHORT_ID_PARTITION_HEARTBEAT,
+                             SHORT_ID_PARTITION_LEASE,
+                             SHORT_ID_PARTITION_PREFIX_LENGTH,
+                             SHORTENED_ID_GEN_LENGTH)
+from yacut.exceptions import ShortIDGenerationError
+from yacut.short_codec import BASE, key_to_short
+
+SUFFIX_LENGTH = SHORTENED_ID_GEN_LENGTH - SHORT_ID_PARTITION_PREFIX_LENGTH
+PARTITION_SIZE = BASE ** SUFFIX_LENGTH
+# Сеть Фейстеля работает с двумя половинами суффикса одинаковой длины
+FEISTEL_HALF_SIZE = BASE ** (SUFFIX_LENGTH // 2)
+FEISTEL_ROUNDS = 6
+CLAIM_ATTEMPTS = 10
+# Отметка продления аренды у освобождённого раздела: такой раздел
+# считается просроченным и сразу может быть перехвачен
+RELEASED_HEARTBEAT = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def partition_key(secret_key: str, prefix: str) -> bytes:
+    """Ключ перестановки смещений раздела, производный от SECRET_KEY."""
+    return hmac.new(
+        secret_key.encode(), f'short-id-partition:{prefix}'.encode(),
+        hashlib.sha256
+    ).digest()
+
+
+def permute_offset(offset: int, key: bytes) -> int:
+    """
+    Переставляет смещение внутри раздела сетью Фейстеля с ключом `key`.
+
+    Каждый раунд обратим, поэтому отображение — биекция на
+    [0, PARTITION_SIZE): разные смещения дают разные суффиксы. Без ключа
+    по одному выданному ID нельзя вычислить остальные.
+    """
+    left, right = divmod(offset, FEISTEL_HALF_SIZE)
+    for round_number in range(FEISTEL_ROUNDS):
+        digest = hmac.new(
+            key, f'{round_number}:{right}'.encode(), hashlib.sha256
+        ).digest()
+        left, right = right, (
+            left + int.from_bytes(digest[:8], 'big')
+        ) % FEISTEL_HALF_SIZE
+    return left * FEISTEL_HALF_SIZE + right
+
+
+class PartitionedGenerator:
+    """
+    Генератор коротких ID без коллизий между процессами и узлами.
+
+    Каждый процесс арендует раздел пространства ID — двухсимвольный
+    префикс, зарегистрированный в таблице `short_id_partition`, — и
+    генерирует только ID с этим префиксом. Смещения внутри раздела
+    резервируются блоками в той же таблице, а затем переставляются
+    ключом, производным от `SECRET_KEY` (см. `permute_offset`), поэтому
+    выдаваемые ID не идут подряд и не выводятся друг из друга.
+
+    Аренда продлевается фоновым потоком каждые
+    `SHORT_ID_PARTITION_HEARTBEAT` секунд и освобождается при завершении
+    процесса. Раздел, владелец которого не продлевал аренду дольше
+    `SHORT_ID_PARTITION_LEASE` (процесс аварийно завершился), может быть
+    перехвачен другим процессом; выдача продолжится с сохранённого
+    смещения, так что ранее выданные ID не повторятся.
+
+    Проверка существования ID остаётся только ради пользовательских
+    ссылок, случайно попавших в раздел.
+    """
+
+    def __init__(self, partition_model):
+        self.table = partition_model.__table__
+        self._lock = threading.Lock()
+        self._heartbeat_stop = None
+        self._reset()
+        atexit.register(self.release)
+
+    def _reset(self) -> None:
+        if self._heartbeat_stop is not None:
+            self._heartbeat_stop.set()
+        self._heartbeat_stop = None
+        self._app: Optional[Flask] = None
+        self._pid = os.getpid()
+        self._owner = f'{socket.gethostname()}:{self._pid}'
+        self.prefix = None
+        self._key = b''
+        self._offset = self._block_end = 0
+
+    def stale_partition_query(self, cutoff: datetime):
+        """Запрос раздела с истёкшей арендой и свободными смещениями."""
+        table = self.table
+        return select(table.c.prefix).where(
+            table.c.heartbeat_at < cutoff,
+            table.c.next_offset < PARTITION_SIZE
+        ).limit(1)
+
+    def reserve_block_statement(self, prefix: str, owner: str):
+        """Запрос, резервирующий следующий блок смещений раздела."""
+        table = self.table
+        return update(table).where(
+            table.c.prefix == prefix, table.c.owner == owner
+        ).values(
+            next_offset=table.c.next_offset + SHORT_ID_PARTITION_BLOCK_SIZE,
+            heartbeat_at=datetime.now(timezone.utc)
+        )
+
+    def _take_over_stale(self, connection: Connection,
+                         now: datetime) -> Optional[str]:
+        table = self.table
+        cutoff = now - timedelta(seconds=SHORT_ID_PARTITION_LEASE)
+        stale = connection.execute(
+            self.stale_partition_query(cutoff)
+        ).scalar()
+        if stale is None:
+            return None
+        taken_over = connection.execute(
+            update(table).where(
+                table.c.prefix == stale, table.c.heartbeat_at < cutoff
+            ).values(owner=self._owner, heartbeat_at=now)
+        ).rowcount
+        return stale if taken_over else None
+
+    def _register_new(self, connection: Connection, now: datetime) -> str:
+        registered = set(connection.execute(select(self.table.c.prefix))
+                         .scalars())
+        free = [
+            ''.join(symbols) for symbols in itertools.product(
+                SHORT_ID_ALPHABET, repeat=SHORT_ID_PARTITION_PREFIX_LENGTH
+            )
+            if ''.join(symbols) not in registered
+        ]
+        if not free:
+            raise ShortIDGenerationError(
+                'Все разделы пространства коротких ID заняты.'
+            )
+        prefix = random.choice(free)
+        connection.execute(insert(self.table).values(
+            prefix=prefix, owner=self._owner, next_offset=0,
+            registered_at=now, heartbeat_at=now
+        ))
+        return prefix
+
+    def _claim_partition(self) -> str:
+        for _ in range(CLAIM_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            try:
+                with db.engine.begin() as connection:
+                    return (
+                        self._take_over_stale(connection, now)
+                        or self._register_new(connection, now)
+                    )
+            except IntegrityError:
+                continue
+        raise ShortIDGenerationError(
+            f'Не удалось зарегистрировать раздел за {CLAIM_ATTEMPTS} '
+            'попыток.'
+        )
+
+    def _start_heartbeat(self) -> None:
+        if self._heartbeat_stop is not None:
+            self._heartbeat_stop.set()
+        self._heartbeat_stop = threading.Event()
+        threading.Thread(
+            target=self._heartbeat,
+            args=(self._app, self.prefix, self._heartbeat_stop),
+            daemon=True
+        ).start()
+
+    def _renew(self, prefix: str, heartbeat_at: datetime) -> bool:
+        table = self.table
+        with db.engine.begin() as connection:
+            return bool(connection.execute(
+                update(table).where(
+                    table.c.prefix == prefix, table.c.owner == self._owner
+                ).values(heartbeat_at=heartbeat_at)
+            ).rowcount)
+
+    def _heartbeat(self, app: Flask, prefix: str,
+                   stop: threading.Event) -> None:
+        """Продлевает аренду раздела, пока он принадлежит процессу."""
+        while not stop.wait(SHORT_ID_PARTITION_HEARTBEAT):
+            with app.app_context():
+                try:
+                    if not self._renew(prefix, datetime.now(timezone.utc)):
+                        return
+                except SQLAlchemyError:
+                    app.logger.exception(
+                        f'Не удалось продлить аренду раздела {prefix}'
+                    )
+
+    def release(self) -> None:
+        """Освобождает раздел, чтобы его сразу мог занять другой процесс."""
+        with self._lock:
+            if (self.prefix is None or self._app is None
+                    or os.getpid() != self._pid):
+                return
+            prefix, app = self.prefix, self._app
+            self._reset()
+        with app.app_context():
+            try:
+                self._renew(prefix, RELEASED_HEARTBEAT)
+            except SQLAlchemyError:
+                app.logger.exception(
+                    f'Не удалось освободить раздел {prefix}'
+                )
+
+    def _reserve_block(self) -> None:
+        """Резервирует следующий блок смещений в своём разделе."""
+        table = self.table
+        while True:
+            if self.prefix is None:
+                self._app = current_app._get_current_object()
+                self.prefix = self._claim_partition()
+                self._key = partition_key(
+                    self._app.config['SECRET_KEY'], self.prefix
+                )
+                self._start_heartbeat()
+            with db.engine.begin() as connection:
+                reserved = connection.execute(
+                    self.reserve_block_statement(self.prefix, self._owner)
+                ).rowcount
+                block_end = connection.execute(
+                    select(table.c.next_offset)
+                    .where(table.c.prefix == self.prefix)
+                ).scalar()
+            block_start = block_end - SHORT_ID_PARTITION_BLOCK_SIZE
+            if reserved and block_start < PARTITION_SIZE:
+                self._offset = block_start
+                self._block_end = min(block_end, PARTITION_SIZE)
+                return
+            self.prefix = None
+
+    def _next_candidate(self) -> str:
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._reset()
+            if self._offset >= self._block_end:
+                self._reserve_block()
+            offset = self._offset
+            self._offset += 1
+            suffix = key_to_short(
+                permute_offset(offset, self._key), SUFFIX_LENGTH
+            )
+            return self.prefix + suffix
+
+    def generate(self, is_taken: Callable[[str], bool]) -> str:
+        """
+        Возвращает следующий свободный ID из раздела текущего процесса.
+
+        Args:
+            is_taken (Callable[[str], bool]): Проверка, занят ли ID
+                пользовательской ссылкой.
+
+        Raises:
+            ShortIDGenerationError: Если не удалось получить свободный ID.
+        """
+        for _ in range(MAX_GEN_ATTEMPTS):
+            candidate = self._next_candidate()
+            if not is_taken(candidate):
+                return candidate
+        raise ShortIDGenerationError(
+            f'Не удалось создать уникальный short_id за {MAX_GEN_ATTEMPTS} '
+            'попыток.'
+        )
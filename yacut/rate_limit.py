@@ -0,0 +1,276 @@
+import hmac
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import Flask, current_app, request
+
+from yacut.exceptions import RateLimitExceeded
+
+API_KEY_HEADER = 'X-API-Key'
+MEMORY_BACKEND_MAX_KEYS = 100_000
+SQLITE_SWEEP_INTERVAL = 60
+
+
+def _take_token(tokens: float, updated: float, now: float,
+                capacity: int, rate: float) -> tuple[float, float]:
+    """
+    Пополняет корзину за прошедшее время и пытается взять один токен.
+
+    Returns:
+        tuple[float, float]: Новое число токенов и время (в секундах),
+        через которое станет доступен следующий токен; 0 — запрос
+        разрешён.
+    """
+    tokens = min(capacity, tokens + max(now - updated, 0) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBackend:
+    """
+    Хранилище корзин токенов в памяти процесса.
+
+    Подходит для одного процесса (в том числе многопоточного). Бюджеты
+    не разделяются между воркерами. Число корзин ограничено `max_keys`:
+    при переполнении вытесняется корзина, к которой дольше всего не
+    обращались, — она, скорее всего, уже наполнилась.
+    """
+
+    def __init__(self, max_keys: int = MEMORY_BACKEND_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, capacity: int, rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, retry_after = _take_token(
+                tokens, updated, now, capacity, rate
+            )
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SQLiteBackend:
+    """
+    Хранилище корзин токенов в общем SQLite-файле.
+
+    Позволяет нескольким процессам на одной машине разделять бюджеты.
+    Чтение и обновление корзины выполняются в одной транзакции
+    `BEGIN IMMEDIATE`, поэтому конкурирующие процессы не теряют
+    списания. Файл работает в режиме WAL с `synchronous=NORMAL`:
+    фиксация не ждёт fsync, а чтения не блокируются записью. Потеря
+    последних списаний при сбое питания для ограничителя допустима.
+
+    Для каждой корзины хранится момент `full_at`, когда она снова
+    наполнится по параметрам своей группы; такие корзины не отличаются
+    от отсутствующих и раз в `SQLITE_SWEEP_INTERVAL` секунд удаляются.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._swept_at = time.monotonic()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS token_buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, '
+                'updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_token_buckets_full_at '
+                'ON token_buckets (full_at)'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def consume(self, key: str, capacity: int, rate: float) -> float:
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM token_buckets WHERE key = ?',
+                (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, retry_after = _take_token(
+                tokens, updated, now, capacity, rate
+            )
+            connection.execute(
+                'INSERT OR REPLACE INTO token_buckets '
+                '(key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (capacity - tokens) / rate)
+            )
+        except sqlite3.Error:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        if time.monotonic() - self._swept_at >= SQLITE_SWEEP_INTERVAL:
+            self.sweep(now)
+        return retry_after
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Удаляет корзины, которые уже наполнились полностью.
+
+        Returns:
+            int: Число удалённых корзин.
+        """
+        self._swept_at = time.monotonic()
+        cursor = self._connection().execute(
+            'DELETE FROM token_buckets WHERE full_at <= ?',
+            (time.time() if now is None else now,)
+        )
+        return cursor.rowcount
+
+
+def scope_path(path: str, scope: str) -> str:
+    """Возвращает путь к SQLite-файлу группы: `ratelimit.<scope>.sqlite3`."""
+    root, extension = os.path.splitext(path)
+    return f'{root}.{scope}{extension}'
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов по алгоритму token bucket.
+
+    Бюджет задаётся отдельно для каждой группы маршрутов (например,
+    `create` и `resolve`) в конфигурации `RATELIMIT_<ГРУППА>` как пара
+    (ёмкость корзины, скорость пополнения в токенах в секунду). Клиент
+    определяется по заголовку `X-API-Key`, только если ключ входит в
+    `RATELIMIT_API_KEYS`; иначе — по IP-адресу. За балансировщиком
+    реальный адрес клиента берётся из `X-Forwarded-For` при заданном
+    `TRUSTED_PROXY_COUNT` (см. `ProxyFix` в `yacut/__init__.py`).
+
+    У каждой группы своё хранилище; SQLite-хранилища групп лежат в
+    отдельных файлах (см. `scope_path`), чтобы всплеск создания ссылок
+    не задерживал переходы на общей блокировке файла.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self._backends = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault('RATELIMIT_ENABLED', False)
+        app.config.setdefault('RATELIMIT_BACKEND', 'memory')
+        app.config.setdefault('RATELIMIT_API_KEYS', frozenset())
+        app.extensions['rate_limiter'] = self
+
+    def backend_for(self, config, scope: str):
+        """Возвращает хранилище корзин группы, создавая его при нужде."""
+        backend = self._backends.get(scope)
+        if backend is not None:
+            return backend
+        with self._lock:
+            if scope not in self._backends:
+                if config['RATELIMIT_BACKEND'] == 'sqlite':
+                    self._backends[scope] = SQLiteBackend(
+                        scope_path(config['RATELIMIT_SQLITE_PATH'], scope)
+                    )
+                else:
+                    self._backends[scope] = MemoryBackend()
+            return self._backends[scope]
+
+    def reset(self) -> None:
+        """Сбрасывает хранилища, чтобы они пересоздались по конфигурации."""
+        with self._lock:
+            self._backends = {}
+
+    @staticmethod
+    def key_for(config, api_key: Optional[str],
+                remote_addr: Optional[str]) -> str:
+        """
+        Возвращает идентификатор клиента для учёта бюджета.
+
+        Непроверенный заголовок `X-API-Key` игнорируется: иначе клиент
+        получал бы новый бюджет, просто меняя значение заголовка.
+        """
+        if api_key:
+            for known_key in config['RATELIMIT_API_KEYS']:
+                if hmac.compare_digest(api_key.encode(), known_key.encode()):
+                    return f'key:{known_key}'
+        return f'ip:{remote_addr}'
+
+    @staticmethod
+    def client_key() -> str:
+        """Возвращает идентификатор клиента текущего запроса."""
+        return RateLimiter.key_for(
+            current_app.config, request.headers.get(API_KEY_HEADER),
+            request.remote_addr
+        )
+
+    def consume(self, config, scope: str, client_key: str) -> float:
+        """
+        Списывает токен из бюджета группы `scope` для клиента.
+
+        Не требует контекста приложения, поэтому используется и уровнем
+        переходов `RedirectDispatcher`.
+
+        Returns:
+            float: 0, если запрос разрешён, иначе число секунд до
+            появления следующего токена.
+        """
+        if not config['RATELIMIT_ENABLED']:
+            return 0.0
+        capacity, rate = config[f'RATELIMIT_{scope.upper()}']
+        return self.backend_for(config, scope).consume(
+            f'{scope}:{client_key}', capacity, rate
+        )
+
+    def check(self, scope: str) -> None:
+        """
+        Списывает токен из бюджета группы `scope` для текущего клиента.
+
+        Raises:
+            RateLimitExceeded: Если бюджет клиента исчерпан.
+        """
+        retry_after = self.consume(
+            current_app.config, scope, self.client_key()
+        )
+        if retry_after:
+            raise RateLimitExceeded(retry_after)
+
+    def limit(self, scope: str,
+              methods: Optional[tuple[str, ...]] = None) -> Callable:
+        """
+        Декоратор представления, ограничивающий частоту запросов.
+
+        Args:
+            scope (str): Группа маршрутов с общим бюджетом.
+            methods (tuple[str, ...], optional): HTTP-методы, к которым
+                применяется ограничение; по умолчанию — ко всем.
+        """
+        def decorator(view: Callable) -> Callable:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if methods is None or request.method in methods:
+                    self.check(scope)
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -0,0 +1,122 @@
+import re
+import time
+from typing import Callable, Iterable, Optional
+
+from flask import Flask
+from sqlalchemy import select
+
+from yacut import access_logger, db, limiter, resolution_cache
+from yacut.constants import SHORTENED_ID_MAX_LENGTH
+from yacut.models import URLMap
+from yacut.rate_limit import API_KEY_HEADER
+from yacut.resolution_cache import NOT_FOUND, PrecompiledRedirect
+from yacut.snapshot import get_snapshot_resolver
+
+SHORT_PATH_REGEX = re.compile(
+    rf'/([a-zA-Z0-9]{{1,{SHORTENED_ID_MAX_LENGTH}}})'
+)
+REDIRECT_METHODS = ('GET', 'HEAD')
+API_KEY_ENVIRON = 'HTTP_' + API_KEY_HEADER.upper().replace('-', '_')
+
+
+class RedirectDispatcher:
+    """
+    WSGI-диспетчер, обслуживающий переходы по коротким ссылкам без Flask.
+
+    Запросы `GET /<short>` обрабатываются напрямую: ответ берётся из
+    кеша подготовленных перенаправлений, а при промахе — строится по
+    снимку URLMap (если задан `URLMAP_SNAPSHOT_PATH`) или по одному
+    запросу к таблице URLMap через движок SQLAlchemy, минуя
+    контекст запроса, сессию, CSRF и обработчики ошибок Flask. Все
+    остальные запросы, а также несуществующие ссылки (ради страницы 404)
+    передаются исходному WSGI-приложению Flask.
+
+    Переходы расходуют тот же бюджет `resolve`, что и в приложении
+    Flask. Клиент определяется так же (см. `RateLimiter.key_for`), а
+    адрес за балансировщиком восстанавливает `ProxyFix`, установленный
+    поверх этого диспетчера. Запрос сверх бюджета передаётся Flask,
+    который отвечает 429 в общем формате.
+    """
+
+    def __init__(self, app: Flask, fallback: Optional[Callable] = None):
+        self.app = app
+        self.fallback = fallback or app.wsgi_app
+        self._engine = None
+        self._reserved_paths = None
+
+    def _reserved(self) -> frozenset:
+        """Одноуровневые пути, занятые собственными маршрутами Flask."""
+        if self._reserved_paths is None:
+            self._reserved_paths = frozenset(
+                rule.rule for rule in self.app.url_map.iter_rules()
+                if not rule.arguments
+            )
+        return self._reserved_paths
+
+    def _lookup(self, short_id: str) -> Optional[str]:
+        snapshot = get_snapshot_resolver(self.app.config)
+        if snapshot is not None:
+            return snapshot.lookup(short_id)
+        with self.app.app_context():
+            if self._engine is None:
+                self._engine = db.engine
+            statement = select(URLMap.original).where(
+                URLMap.short_filter(short_id)
+            )
+        with self._engine.connect() as connection:
+            return connection.execute(statement).scalar()
+
+    def resolve(self, short_id: str) -> tuple[Optional[PrecompiledRedirect],
+                                              str]:
+        """
+        Возвращает подготовленный ответ для короткой ссылки.
+
+        Returns:
+            tuple: Ответ (или None, если ссылки нет) и признак попадания в
+            кеш: 'hit' или 'miss'.
+        """
+        entry = resolution_cache.get(short_id)
+        if entry is NOT_FOUND:
+            return None, 'hit'
+        if entry is not None:
+            return entry, 'hit'
+        original = self._lookup(short_id)
+        if original is None:
+            resolution_cache.put_not_found(short_id)
+            return None, 'miss'
+        entry = PrecompiledRedirect.build(original)
+        resolution_cache.put(short_id, entry)
+        return entry, 'miss'
+
+    def __call__(self, environ: dict,
+                 start_response: Callable) -> Iterable[bytes]:
+        path = environ.get('PATH_INFO', '')
+        match = SHORT_PATH_REGEX.fullmatch(path)
+        if (environ['REQUEST_METHOD'] not in REDIRECT_METHODS
+                or match is None or path in self._reserved()):
+            return self.fallback(environ, start_response)
+        client_key = limiter.key_for(
+            self.app.config, environ.get(API_KEY_ENVIRON),
+            environ.get('REMOTE_ADDR')
+        )
+        if limiter.consume(self.app.config, 'resolve', client_key):
+            return self.fallback(environ, start_response)
+        started = time.perf_counter()
+        entry, cache = self.resolve(match.group(1))
+        if entry is None:
+            return self.fallback(environ, start_response)
+        start_response(entry.status, entry.headers)
+        access_logger.log(
+            self.app.config, match.group(1), int(entry.status[:3]),
+            time.perf_counter() - started, cache, 'wsgi'
+        )
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        return [entry.body]
+
+
+def mount_redirect_tier(app: Flask) -> RedirectDispatcher:
+    """Ставит `RedirectDispatcher` перед WSGI-приложением Flask."""
+    dispatcher = RedirectDispatcher(app)
+    app.wsgi_app = dispatcher
+    return dispatcher
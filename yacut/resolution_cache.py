@@ -0,0 +1,279 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+from flask import Response, redirect
+
+SKETCH_DEPTH = 4
+SKETCH_MAX_COUNT = 15
+SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9,
+    0x94D049BB133111EB, 0xD6E8FEB86659FD93,
+)
+HASH_MASK = (1 << 64) - 1
+# Таблица для bytes.translate: деление каждого счётчика пополам
+SKETCH_HALVE = bytes(count >> 1 for count in range(256))
+WINDOW_RATIO = 0.01
+PROTECTED_RATIO = 0.8
+
+
+class PrecompiledRedirect(NamedTuple):
+    """
+    Полностью подготовленный ответ-перенаправление.
+
+    Attributes:
+        status (str): Строка статуса, например '302 FOUND'.
+        headers (list[tuple[str, str]]): Заголовки в формате WSGI.
+        body (bytes): Тело ответа.
+    """
+
+    status: str
+    headers: list[tuple[str, str]]
+    body: bytes
+
+    @classmethod
+    def build(cls, location: str) -> 'PrecompiledRedirect':
+        """
+        Один раз строит ответ через `redirect()` и сохраняет его части.
+
+        Благодаря этому подготовленный ответ побайтно совпадает с
+        обычным, а экранирование URL и сборка HTML выполняются только при
+        первом обращении.
+        """
+        response = redirect(location)
+        return cls(
+            response.status,
+            response.headers.to_wsgi_list(),
+            response.get_data()
+        )
+
+    def to_response(self) -> Response:
+        return Response(self.body, status=self.status, headers=self.headers)
+
+
+# Отметка в кеше о том, что короткой ссылки не существует
+NOT_FOUND = object()
+
+
+class LRUCache:
+    """Кеш с вытеснением давно не использованных записей."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+
+class FrequencySketch:
+    """
+    Count-Min Sketch с 4-битными счётчиками и периодическим старением.
+
+    Приблизительно оценивает частоту обращений к ключу в недавнем
+    прошлом: после `10 * capacity` обращений все счётчики делятся пополам,
+    поэтому прежняя популярность постепенно забывается.
+    """
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity:
+            width *= 2
+        self._mask = width - 1
+        self._width = width
+        self._table = bytearray(width * SKETCH_DEPTH)
+        self._sample_size = 10 * max(capacity, 1)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        hashed = hash(key) & HASH_MASK
+        for row, seed in enumerate(SKETCH_SEEDS):
+            mixed = ((hashed ^ seed) * 0x2545F4914F6CDD1D) & HASH_MASK
+            yield row * self._width + ((mixed >> 29) & self._mask)
+
+    def increment(self, key: Hashable) -> None:
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < SKETCH_MAX_COUNT:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            # translate обходит таблицу на C: старение не держит общую
+            # блокировку кеша десятки миллисекунд, как генератор
+            self._table = table.translate(SKETCH_HALVE)
+            self._additions //= 2
+
+    def estimate(self, key: Hashable) -> int:
+        return min(self._table[index] for index in self._indexes(key))
+
+
+class TinyLFUCache:
+    """
+    Кеш с политикой W-TinyLFU, устойчивой к «загрязнению» сканированием.
+
+    Новые записи попадают в небольшое LRU-окно (1% ёмкости). Вытесненная
+    из окна запись допускается в основную область (сегментированный LRU:
+    испытательный и защищённый сегменты) только если по оценке
+    `FrequencySketch` к ней обращались чаще, чем к кандидату на
+    вытеснение. Поэтому одноразовые обращения — сканирование случайных
+    ID ботами и разовые переходы — не вытесняют популярные записи.
+    """
+
+    def __init__(self, maxsize: int, window_ratio: float = WINDOW_RATIO,
+                 protected_ratio: float = PROTECTED_RATIO):
+        self.maxsize = maxsize
+        self.window_size = max(1, int(maxsize * window_ratio))
+        self.main_size = max(1, maxsize - self.window_size)
+        self.protected_size = int(self.main_size * protected_ratio)
+        self._window: OrderedDict = OrderedDict()
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self.sketch = FrequencySketch(maxsize)
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        self.sketch.increment(key)
+        for segment in (self._window, self._protected):
+            value = segment.get(key)
+            if value is not None:
+                segment.move_to_end(key)
+                return value
+        value = self._probation.pop(key, None)
+        if value is not None:
+            self._protected[key] = value
+            if len(self._protected) > self.protected_size:
+                demoted, demoted_value = self._protected.popitem(last=False)
+                self._probation[demoted] = demoted_value
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                segment[key] = value
+                return
+        self._window[key] = value
+        if len(self._window) > self.window_size:
+            self._admit(*self._window.popitem(last=False))
+
+    def _admit(self, candidate: Hashable, value: Any) -> None:
+        if len(self._probation) + len(self._protected) < self.main_size:
+            self._probation[candidate] = value
+            return
+        victims = self._probation or self._protected
+        victim = next(iter(victims))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del victims[victim]
+            self._probation[candidate] = value
+
+    def discard(self, key: Hashable) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            segment.pop(key, None)
+
+
+CACHE_POLICIES = {'lru': LRUCache, 'tinylfu': TinyLFUCache}
+
+
+class ResolutionCache:
+    """
+    Кеш результатов поиска по короткой ссылке.
+
+    Хранит два вида записей с раздельными бюджетами: подготовленные
+    перенаправления для существующих ссылок и отметки `NOT_FOUND` для
+    несуществующих. Отметки живут не дольше `negative_ttl` секунд и
+    снимаются при создании ссылки в этом процессе; в других процессах
+    только что созданная ссылка может отвечать 404 до истечения отметки,
+    поэтому срок жизни выбирается коротким. Политика вытеснения —
+    W-TinyLFU (`tinylfu`) или обычный LRU (`lru`).
+
+    Записи URLMap не изменяются после создания, поэтому подготовленные
+    перенаправления инвалидировать не требуется.
+    """
+
+    def __init__(self, maxsize: int, negative_maxsize: int = 0,
+                 negative_ttl: float = 2, policy: str = 'tinylfu'):
+        self.maxsize = maxsize
+        self.negative_maxsize = negative_maxsize
+        self.negative_ttl = negative_ttl
+        self._cache_class = CACHE_POLICIES[policy]
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._positive = self._cache_class(self.maxsize)
+        self._negative = (
+            self._cache_class(self.negative_maxsize)
+            if self.negative_maxsize else None
+        )
+        self.hits = self.negative_hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._positive)
+
+    def get(self, short_id: str):
+        """
+        Возвращает подготовленный ответ, `NOT_FOUND` или None при промахе.
+        """
+        with self._lock:
+            entry = self._positive.get(short_id)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            if self._is_not_found(short_id):
+                return NOT_FOUND
+            self.misses += 1
+            return None
+
+    def get_not_found(self, short_id: str):
+        """Возвращает `NOT_FOUND`, если ссылка отмечена как отсутствующая."""
+        with self._lock:
+            return NOT_FOUND if self._is_not_found(short_id) else None
+
+    def _is_not_found(self, short_id: str) -> bool:
+        if self._negative is None:
+            return False
+        expires_at = self._negative.get(short_id)
+        if expires_at is None or expires_at <= time.monotonic():
+            return False
+        self.negative_hits += 1
+        return True
+
+    def put(self, short_id: str, entry: PrecompiledRedirect) -> None:
+        with self._lock:
+            self._positive.put(short_id, entry)
+
+    def put_not_found(self, short_id: str) -> None:
+        """Запоминает, что короткой ссылки не существует."""
+        if self._negative is None:
+            return
+        with self._lock:
+            self._negative.put(
+                short_id, time.monotonic() + self.negative_ttl
+            )
+
+    def discard(self, short_id: str) -> None:
+        with self._lock:
+            self._positive.discard(short_id)
+            if self._negative is not None:
+                self._negative.discard(short_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
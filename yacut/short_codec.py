@@ -0,0 +1,60 @@
+from typing import Optional
+
+from yacut.constants import SHORT_ID_ALPHABET, SHORTENED_ID_GEN_LENGTH
+
+BASE = len(SHORT_ID_ALPHABET)
+_SYMBOL_VALUES = {
+    symbol: value for value, symbol in enumerate(SHORT_ID_ALPHABET)
+}
+
+
+def short_to_key(short_id: str) -> Optional[int]:
+    """
+    Декодирует короткий идентификатор генерируемой длины в целое число.
+
+    Идентификатор рассматривается как число в системе счисления с
+    основанием 62 (алфавит `SHORT_ID_ALPHABET`). Так как длина
+    фиксирована, отображение взаимно однозначно, а результат
+    (меньше 62 ** 6) помещается в 64-битный BIGINT.
+
+    Args:
+        short_id (str): Короткий идентификатор.
+
+    Returns:
+        Optional[int]: Целочисленный ключ или None, если длина
+        идентификатора отличается от генерируемой либо он содержит
+        недопустимые символы.
+    """
+    if len(short_id) != SHORTENED_ID_GEN_LENGTH:
+        return None
+    key = 0
+    for symbol in short_id:
+        value = _SYMBOL_VALUES.get(symbol)
+        if value is None:
+            return None
+        key = key * BASE + value
+    return key
+
+
+def key_to_short(key: int, length: int = SHORTENED_ID_GEN_LENGTH) -> str:
+    """
+    Кодирует целочисленный ключ обратно в короткий идентификатор.
+
+    Args:
+        key (int): Ключ, полученный из `short_to_key`.
+        length (int): Длина результата (дополняется старшими нулями).
+
+    Returns:
+        str: Короткий идентификатор длиной `length`.
+
+    Raises:
+        ValueError: Если ключ не помещается в идентификатор длины
+            `length`.
+    """
+    if not 0 <= key < BASE ** length:
+        raise ValueError(f'Ключ {key} вне допустимого диапазона')
+    symbols = []
+    for _ in range(length):
+        key, value = divmod(key, BASE)
+        symbols.append(SHORT_ID_ALPHABET[value])
+    return ''.join(reversed(symbols))
@@ -0,0 +1,164 @@
+import threading
+from bisect import bisect_left, insort
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from yacut import db
+from yacut.constants import SHORT_INDEX_MAX_SIZE, SHORTENED_ID_MAX_LENGTH
+from yacut.models import URLMap
+
+INDEX_LOAD_BATCH_SIZE = 10_000
+# Ключ в `Session.info` для ссылок, вставленных в ещё не
+# зафиксированной транзакции
+PENDING_SHORTS_KEY = 'short_index_pending'
+
+
+class ShortIDIndex:
+    """
+    Отсортированный индекс занятых коротких ссылок в памяти процесса.
+
+    Загружается из базы данных один раз при первом обращении и затем
+    пополняется ссылками, вставленными в этом процессе, после фиксации
+    транзакции. Вставки из других процессов индекс не видит, поэтому
+    служит лишь фильтром: имена, которые он считает свободными,
+    проверяются одним запросом `IN` к базе данных, а найденные там
+    занятые имена добавляются в индекс. Ответ всё равно носит
+    рекомендательный характер — окончательную проверку уникальности
+    выполняет база данных при создании записи.
+
+    Индекс рассчитан на небольшие таблицы: строки хранятся в одном
+    отсортированном списке (вставка — O(n)), а загрузка выполняется в
+    потоке первого запроса. Если ссылок больше `SHORT_INDEX_MAX_SIZE`,
+    индекс не строится, и проверки идут запросами к базе данных по
+    уникальному индексу на `short`.
+    """
+
+    def __init__(self):
+        self._shorts: list[str] = []
+        self._loaded = False
+        self._enabled = True
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.session.execute(
+                select(URLMap.short).order_by(URLMap.short_binary())
+                .limit(SHORT_INDEX_MAX_SIZE + 1)
+                .execution_options(yield_per=INDEX_LOAD_BATCH_SIZE)
+            )
+            self._shorts = list(rows.scalars())
+            self._enabled = len(self._shorts) <= SHORT_INDEX_MAX_SIZE
+            if not self._enabled:
+                self._shorts = []
+            self._loaded = True
+
+    @staticmethod
+    def _taken_in_db(candidates: list[str]) -> set[str]:
+        return set(db.session.execute(
+            select(URLMap.short).where(URLMap.short.in_(candidates))
+        ).scalars())
+
+    def _contains(self, short_id: str) -> bool:
+        position = bisect_left(self._shorts, short_id)
+        return (
+            position < len(self._shorts)
+            and self._shorts[position] == short_id
+        )
+
+    def reset(self) -> None:
+        """Сбрасывает индекс; он будет заново загружен при обращении."""
+        with self._lock:
+            self._shorts = []
+            self._loaded = False
+            self._enabled = True
+
+    def add(self, short_id: str) -> None:
+        """Добавляет короткую ссылку в индекс, если он уже загружен."""
+        with self._lock:
+            if (self._loaded and self._enabled
+                    and not self._contains(short_id)):
+                insort(self._shorts, short_id)
+
+    def is_available(self, short_id: str) -> bool:
+        """Проверяет, свободна ли короткая ссылка."""
+        self._ensure_loaded()
+        return not self._is_taken([short_id])
+
+    def _is_taken(self, candidates: list[str]) -> set[str]:
+        taken = set()
+        if self._enabled:
+            with self._lock:
+                taken = {
+                    candidate for candidate in candidates
+                    if self._contains(candidate)
+                }
+        unknown = [
+            candidate for candidate in candidates if candidate not in taken
+        ]
+        if unknown:
+            found = self._taken_in_db(unknown)
+            for short_id in found:
+                self.add(short_id)
+            taken |= found
+        return taken
+
+    def suggest(self, name: str, count: int) -> list[str]:
+        """
+        Подбирает `count` свободных вариантов вида `<name><номер>`.
+
+        Если вариант не помещается в `SHORTENED_ID_MAX_LENGTH`, имя
+        укорачивается справа.
+
+        Args:
+            name (str): Желаемое имя короткой ссылки.
+            count (int): Сколько вариантов вернуть.
+
+        Returns:
+            list[str]: Свободные варианты в порядке возрастания номера.
+        """
+        self._ensure_loaded()
+        suggestions = []
+        seen = set()
+        number = 0
+        while len(suggestions) < count:
+            candidates = []
+            for number in range(number + 1, number + 1 + count):
+                suffix = str(number)
+                candidate = (
+                    name[:SHORTENED_ID_MAX_LENGTH - len(suffix)] + suffix
+                )
+                if candidate not in seen:
+                    seen.add(candidate)
+                    candidates.append(candidate)
+            taken = self._is_taken(candidates)
+            suggestions.extend(
+                candidate for candidate in candidates
+                if candidate not in taken
+            )
+        return suggestions[:count]
+
+
+short_index = ShortIDIndex()
+
+
+@event.listens_for(URLMap, 'after_insert')
+def _remember_inserted(mapper, connection, target: URLMap) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_SHORTS_KEY, []).append(target.short)
+
+
+@event.listens_for(Session, 'after_commit')
+def _add_committed(session: Session) -> None:
+    for short_id in session.info.pop(PENDING_SHORTS_KEY, ()):
+        short_index.add(short_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(PENDING_SHORTS_KEY, None)
@@ -0,0 +1,67 @@
+import threading
+
+from flask import current_app, has_request_context, request, url_for
+
+from yacut.constants import SHORT_URL_PREFIX_CACHE_SIZE
+from yacut.resolution_cache import LRUCache
+
+_PLACEHOLDER = 'short'
+
+# Префиксы коротких ссылок, построенные через url_for, по ключу хоста.
+# Заголовок Host задаёт клиент, поэтому кеш ограничен по размеру
+_prefixes = LRUCache(SHORT_URL_PREFIX_CACHE_SIZE)
+_prefixes_lock = threading.Lock()
+
+
+def _prefix_cache_key() -> str:
+    if has_request_context():
+        return request.url_root
+    server_name = current_app.config.get('SERVER_NAME')
+    if not server_name:
+        raise RuntimeError(
+            'Вне контекста запроса короткую ссылку можно построить, только '
+            'если задан SHORT_URL_BASE или SERVER_NAME.'
+        )
+    return server_name
+
+
+def get_short_url_prefix() -> str:
+    """
+    Возвращает общую часть всех коротких ссылок (со слешем на конце).
+
+    Если задан `SHORT_URL_BASE`, используется он. Иначе префикс один раз
+    строится через `url_for` для текущего хоста (или `SERVER_NAME` вне
+    контекста запроса) и кешируется; в кеше хранятся префиксы не более
+    чем `SHORT_URL_PREFIX_CACHE_SIZE` последних хостов.
+
+    Raises:
+        RuntimeError: Если вне контекста запроса не задан ни
+            `SHORT_URL_BASE`, ни `SERVER_NAME`.
+    """
+    base = current_app.config['SHORT_URL_BASE']
+    if base:
+        return base.rstrip('/') + '/'
+    cache_key = _prefix_cache_key()
+    with _prefixes_lock:
+        prefix = _prefixes.get(cache_key)
+    if prefix is None:
+        url = url_for(
+            'redirect_to_original', short=_PLACEHOLDER, _external=True
+        )
+        prefix = url[:-len(_PLACEHOLDER)]
+        with _prefixes_lock:
+            _prefixes.put(cache_key, prefix)
+    return prefix
+
+
+def build_short_url(short_id: str) -> str:
+    """
+    Строит полную короткую ссылку конкатенацией префикса и short_id.
+
+    Args:
+        short_id (str): Короткий идентификатор ссылки.
+
+    Returns:
+        str: Полная короткая ссылка (например, http://localhost/abc123).
+    """
+    return get_short_url_prefix() + short_id
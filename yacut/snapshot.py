@@ -0,0 +1,269 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Iterable, Iterator, Optional
+
+MAGIC = b'YCSNAP01'
+HEADER = struct.Struct('<8sQQQ')
+OFFSET = struct.Struct('<Q')
+SHORT_LENGTH = struct.Struct('<B')
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+class SnapshotFormatError(ValueError):
+    """Файл не является снимком URLMap или повреждён."""
+
+
+def write_snapshot(path: str, rows: Iterable[tuple[str, str]],
+                   high_water_id: int = 0) -> int:
+    """
+    Записывает снимок таблицы URLMap в файл.
+
+    Формат файла:
+    - заголовок: сигнатура, число записей, наибольший `id` попавших в
+      снимок записей и смещение массива смещений;
+    - блок записей: для каждой записи длина `short` (1 байт), `short` и
+      `original` в UTF-8;
+    - массив из `count + 1` смещений начала каждой записи (uint64 LE),
+      последнее смещение — конец блока записей.
+
+    Записи должны идти в порядке возрастания `short` (побайтово), что
+    позволяет искать их двоичным поиском. Файл сначала пишется рядом под
+    временным именем и затем атомарно заменяет старый снимок, поэтому
+    процессы, уже открывшие старый снимок, продолжают работать с ним.
+
+    Args:
+        path (str): Путь к файлу снимка.
+        rows (Iterable[tuple[str, str]]): Пары (short, original),
+            отсортированные по short.
+        high_water_id (int): Наибольший `id` записей в снимке.
+
+    Returns:
+        int: Количество записанных записей.
+
+    Raises:
+        ValueError: Если записи не отсортированы по short.
+    """
+    offsets = array('Q')
+    tmp_path = f'{path}.tmp'
+    previous = None
+    with open(tmp_path, 'wb') as snapshot:
+        snapshot.write(b'\0' * HEADER.size)
+        position = HEADER.size
+        for short, original in rows:
+            short_bytes = short.encode()
+            if previous is not None and short_bytes <= previous:
+                raise ValueError(
+                    'Записи снимка должны быть отсортированы по short: '
+                    f'{short!r} после {previous.decode()!r}'
+                )
+            previous = short_bytes
+            record = (
+                SHORT_LENGTH.pack(len(short_bytes)) + short_bytes
+                + original.encode()
+            )
+            offsets.append(position)
+            snapshot.write(record)
+            position += len(record)
+        offsets.append(position)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        snapshot.write(offsets.tobytes())
+        snapshot.seek(0)
+        snapshot.write(HEADER.pack(
+            MAGIC, len(offsets) - 1, high_water_id, position
+        ))
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(tmp_path, path)
+    return len(offsets) - 1
+
+
+class Snapshot:
+    """
+    Снимок таблицы URLMap, отображённый в память только для чтения.
+
+    Открытие не читает данные: разбирается только заголовок, а страницы
+    файла подгружаются по мере обращения и разделяются между процессами
+    через страничный кеш ОС.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as snapshot:
+            self._mmap = mmap.mmap(
+                snapshot.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            self._check_format(path)
+        except SnapshotFormatError:
+            self._mmap.close()
+            raise
+
+    def _check_format(self, path: str) -> None:
+        """
+        Разбирает заголовок и проверяет, что файл не обрезан.
+
+        Без проверки размера обрезанный снимок открывался бы успешно, а
+        каждый поиск затем падал бы с `struct.error`.
+        """
+        if len(self._mmap) < HEADER.size:
+            raise SnapshotFormatError(f'{path}: файл слишком мал')
+        magic, self.count, self.high_water_id, self._offsets_at = (
+            HEADER.unpack_from(self._mmap)
+        )
+        if magic != MAGIC:
+            raise SnapshotFormatError(f'{path}: неизвестный формат')
+        expected_size = self._offsets_at + (self.count + 1) * OFFSET.size
+        if expected_size != len(self._mmap):
+            raise SnapshotFormatError(
+                f'{path}: размер файла {len(self._mmap)} байт, ожидалось '
+                f'{expected_size} — файл обрезан или повреждён'
+            )
+        if self._offset(self.count) != self._offsets_at:
+            raise SnapshotFormatError(f'{path}: повреждён массив смещений')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _offset(self, index: int) -> int:
+        return OFFSET.unpack_from(
+            self._mmap, self._offsets_at + index * OFFSET.size
+        )[0]
+
+    def _record(self, index: int) -> tuple[bytes, int, int]:
+        """Возвращает short записи и границы её `original` в файле."""
+        start, end = self._offset(index), self._offset(index + 1)
+        short_end = start + 1 + self._mmap[start]
+        return self._mmap[start + 1:short_end], short_end, end
+
+    def lookup(self, short_id: str) -> Optional[str]:
+        """
+        Ищет оригинальную ссылку двоичным поиском по short.
+
+        Returns:
+            Optional[str]: Оригинальная ссылка или None, если её нет.
+        """
+        key = short_id.encode()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            short, original_start, original_end = self._record(middle)
+            if short == key:
+                return self._mmap[original_start:original_end].decode()
+            if short < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        for index in range(self.count):
+            short, original_start, original_end = self._record(index)
+            yield (
+                short.decode(),
+                self._mmap[original_start:original_end].decode()
+            )
+
+
+def merge_snapshot(path: str, changes: Iterable[tuple[str, str]],
+                   high_water_id: int) -> int:
+    """
+    Применяет к снимку дельту вместо полной повторной выгрузки.
+
+    Новые записи сортируются в памяти (дельта невелика) и сливаются со
+    старым снимком за один последовательный проход. При совпадении
+    short побеждает запись из дельты.
+
+    Args:
+        path (str): Путь к существующему файлу снимка.
+        changes (Iterable[tuple[str, str]]): Новые пары (short, original).
+        high_water_id (int): Наибольший `id` после применения дельты.
+
+    Returns:
+        int: Количество записей в новом снимке.
+    """
+    delta = sorted(dict(changes).items(), key=lambda row: row[0].encode())
+    snapshot = Snapshot(path)
+    try:
+        return write_snapshot(
+            path, _merge_sorted(iter(snapshot), delta), high_water_id
+        )
+    finally:
+        snapshot.close()
+
+
+def _merge_sorted(old: Iterator[tuple[str, str]],
+                  delta: list[tuple[str, str]]) -> Iterator[tuple[str, str]]:
+    delta_index = 0
+    for short, original in old:
+        key = short.encode()
+        while (delta_index < len(delta)
+               and delta[delta_index][0].encode() < key):
+            yield delta[delta_index]
+            delta_index += 1
+        if delta_index < len(delta) and delta[delta_index][0] == short:
+            continue
+        yield short, original
+    yield from delta[delta_index:]
+
+
+class SnapshotResolver:
+    """
+    Источник оригинальных ссылок из файла снимка.
+
+    Не чаще раза в `RELOAD_CHECK_INTERVAL` секунд проверяет, не был ли
+    файл заменён новым снимком, и при необходимости переоткрывает его.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._identity = self._file_identity()
+        self.snapshot = Snapshot(path)
+
+    def _file_identity(self) -> tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _reload_if_replaced(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            identity = self._file_identity()
+            if identity != self._identity:
+                self.snapshot = Snapshot(self.path)
+                self._identity = identity
+
+    def lookup(self, short_id: str) -> Optional[str]:
+        self._reload_if_replaced()
+        return self.snapshot.lookup(short_id)
+
+
+_resolvers: dict[str, SnapshotResolver] = {}
+
+
+def get_snapshot_resolver(config) -> Optional[SnapshotResolver]:
+    """
+    Возвращает резолвер снимка, заданного в `URLMAP_SNAPSHOT_PATH`.
+
+    Returns:
+        Optional[SnapshotResolver]: Резолвер или None, если снимок не
+        настроен.
+    """
+    path = config['URLMAP_SNAPSHOT_PATH']
+    if not path:
+        return None
+    resolver = _resolvers.get(path)
+    if resolver is None:
+        resolver = _resolvers.setdefault(path, SnapshotResolver(path))
+    return resolver
@@ -1,5 +1,11 @@
-from typing import Any, Dict
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
+from werkzeug.datastructures import MultiDict
+
+from yacut.constants import (ASCII_DIGITS_REGEX, CUSTOM_ID_REGEX,
+                             QUERY_INT_MAX, SHORTENED_ID_MAX_LENGTH)
 from yacut.error_handlers import InvalidAPIUsage
 
 
@@ -16,3 +22,104 @@ def validate_data(data: Dict[str, Any]) -> None:
 
     if 'url' not in data:
         raise InvalidAPIUsage('\"url\" является обязательным полем!')
+
+
+def parse_positive_int(args: MultiDict, name: str,
+                       default: Optional[int] = None,
+                       maximum: Optional[int] = None) -> Optional[int]:
+    """
+    Читает из параметров запроса положительное целое число.
+
+    Raises:
+        InvalidAPIUsage: Если значение не является положительным целым.
+    """
+    value = _parse_int(
+        args, name, 1,
+        f'Параметр "{name}" должен быть положительным целым числом'
+    )
+    if value is None:
+        return default
+    return min(value, maximum) if maximum else value
+
+
+def parse_non_negative_int(args: MultiDict, name: str,
+                           default: Optional[int] = None) -> Optional[int]:
+    """
+    Читает из параметров запроса неотрицательное целое число.
+
+    Raises:
+        InvalidAPIUsage: Если значение не является неотрицательным целым.
+    """
+    value = _parse_int(
+        args, name, 0,
+        f'Параметр "{name}" должен быть неотрицательным целым числом'
+    )
+    return default if value is None else value
+
+
+def _parse_int(args: MultiDict, name: str, minimum: int,
+               message: str) -> Optional[int]:
+    """
+    Читает из параметров запроса целое число не меньше `minimum`.
+
+    Допускаются только ASCII-цифры (`str.isdigit()` пропускает, например,
+    '²', который не принимает `int()`), а значение ограничено
+    `QUERY_INT_MAX`, чтобы его можно было передать в базу данных.
+
+    Raises:
+        InvalidAPIUsage: С сообщением `message`, если значение некорректно.
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    if not re.fullmatch(ASCII_DIGITS_REGEX, value):
+        raise InvalidAPIUsage(message)
+    try:
+        value = int(value)
+    except ValueError:
+        raise InvalidAPIUsage(message)
+    if not minimum <= value <= QUERY_INT_MAX:
+        raise InvalidAPIUsage(message)
+    return value
+
+
+def parse_datetime(args: MultiDict, name: str) -> Optional[datetime]:
+    """
+    Читает из параметров запроса дату и время в формате ISO 8601.
+
+    Время с часовым поясом приводится к UTC, так как `timestamp`
+    хранится в UTC без указания пояса.
+
+    Raises:
+        InvalidAPIUsage: Если значение не в формате ISO 8601.
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidAPIUsage(
+            f'Параметр "{name}" должен быть датой в формате ISO 8601'
+        )
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_short_prefix(args: MultiDict, name: str) -> Optional[str]:
+    """
+    Читает из параметров запроса префикс короткой ссылки.
+
+    Raises:
+        InvalidAPIUsage: Если префикс содержит недопустимые символы.
+    """
+    value = args.get(name)
+    if not value:
+        return None
+    if (not re.fullmatch(CUSTOM_ID_REGEX, value)
+            or len(value) > SHORTENED_ID_MAX_LENGTH):
+        raise InvalidAPIUsage(
+            f'Параметр "{name}" содержит недопустимые символы'
+        )
+    return value
@@ -1,15 +1,20 @@
-from typing import Union
+from typing import Optional, Union
 
-from flask import Response, flash, redirect, render_template
+from flask import Response, abort, flash, g, redirect, render_template
 from sqlalchemy.exc import SQLAlchemyError
 
-from yacut import app, db
+from yacut import access_logger, app, db, limiter, resolution_cache
+from yacut.constants import SUGGESTIONS_COUNT
 from yacut.exceptions import ShortIDGenerationError
 from yacut.forms import CreateLinkForm
 from yacut.models import URLMap
+from yacut.resolution_cache import NOT_FOUND, PrecompiledRedirect
+from yacut.short_index import short_index
+from yacut.snapshot import get_snapshot_resolver
 
 
 @app.route('/', methods=['GET', 'POST'])
+@limiter.limit('create', methods=('POST',))
 def index_view() -> str:
     """
     Обрабатывает GET и POST-запросы к главной странице.
@@ -37,6 +42,12 @@ def index_view() -> str:
 
     except ValueError as e:
         flash(str(e), 'error')
+        if custom_id and not short_index.is_available(custom_id):
+            flash(
+                'Свободные варианты: '
+                + ', '.join(short_index.suggest(custom_id, SUGGESTIONS_COUNT)),
+                'info'
+            )
         return render_template('index.html', form=form)
     except ShortIDGenerationError as e:
         flash(
@@ -57,11 +68,32 @@ def index_view() -> str:
     )
 
 
+def find_original(short: str) -> Optional[str]:
+    """
+    Возвращает оригинальную ссылку по короткому идентификатору.
+
+    Если задан `URLMAP_SNAPSHOT_PATH`, ссылка ищется только в снимке,
+    без обращения к базе данных.
+    """
+    snapshot = get_snapshot_resolver(app.config)
+    if snapshot is not None:
+        return snapshot.lookup(short)
+    url_map = URLMap.get_by_short(short)
+    return url_map.original if url_map else None
+
+
 @app.route('/<string:short>', methods=['GET'])
+@access_logger.track
+@limiter.limit('resolve')
 def redirect_to_original(short: str) -> Union[Response, str]:
     """
     Перенаправляет пользователя по короткой ссылке.
 
+    В режиме `REDIRECT_PRECOMPILED` ответ строится один раз и затем
+    отдаётся из кеша без обращения к базе данных. Отсутствие ссылки
+    кешируется в любом режиме, чтобы повторные запросы несуществующих
+    ссылок не доходили до базы.
+
     Args:
         short (str): Короткий идентификатор, используемый для поиска
         оригинальной ссылки.
@@ -70,5 +102,22 @@ def redirect_to_original(short: str) -> Union[Response, str]:
         Response: HTTP-перенаправление на оригинальную ссылку.
         str: Если не найдено — Flask автоматически вернёт 404.
     """
-    url_map = URLMap.query.filter_by(short=short).first_or_404()
-    return redirect(url_map.original)
+    precompiled = app.config['REDIRECT_PRECOMPILED']
+    if precompiled:
+        cached = resolution_cache.get(short)
+    else:
+        cached = resolution_cache.get_not_found(short)
+    g.resolution_cache = 'miss' if cached is None else 'hit'
+    if cached is NOT_FOUND:
+        abort(404)
+    if cached is not None:
+        return cached.to_response()
+    original = find_original(short)
+    if original is None:
+        resolution_cache.put_not_found(short)
+        abort(404)
+    if not precompiled:
+        return redirect(original)
+    cached = PrecompiledRedirect.build(original)
+    resolution_cache.put(short, cached)
+    return cached.to_response()